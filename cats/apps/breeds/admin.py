@@ -1,11 +1,20 @@
 from django.contrib import admin
 
-from cats.apps.breeds.models import Breed, Image
+from cats.apps.breeds.models import Breed, Image, ImageVariant, SyncCheckpoint
+
+
+class ImageVariantInline(admin.TabularInline):
+    model = ImageVariant
+    fields = ("width", "height", "format", "size", "file")
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
 
 
 @admin.register(Image)
 class ImageAdmin(admin.ModelAdmin):
     list_display = ("pk", "external_id", "url")
+    inlines = (ImageVariantInline,)
 
 
 @admin.register(Breed)
@@ -90,3 +99,8 @@ class BreedAdmin(admin.ModelAdmin):
             },
         ),
     )
+
+
+@admin.register(SyncCheckpoint)
+class SyncCheckpointAdmin(admin.ModelAdmin):
+    list_display = ("pk", "name", "page", "updated_at")
@@ -0,0 +1,104 @@
+from rest_framework import serializers
+
+from cats.apps.breeds.models import Breed, Image
+from cats.apps.breeds.search import highlight
+
+
+class SparseFieldsMixin:
+    """
+    Serializer taking a ``fields`` argument listing which of its fields to
+    keep; the rest are dropped.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class ImageSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Image
+        fields = [
+            "id",
+            "external_id",
+            "width",
+            "height",
+            "url",
+            "blurhash",
+            "dominant_color",
+            "likes",
+            "hates",
+        ]
+
+    def get_url(self, obj):
+        """The stored copy when there is one, the upstream URL otherwise."""
+        return obj.image.url if obj.image else obj.url
+
+
+class BreedSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    image = ImageSerializer(read_only=True)
+
+    class Meta:
+        model = Breed
+        fields = [
+            "id",
+            "external_id",
+            "name",
+            "description",
+            "alt_names",
+            "origin",
+            "country_code",
+            "temperament",
+            "vetstreet_url",
+            "wikipedia_url",
+            "weight_imperial_min",
+            "weight_imperial_max",
+            "weight_metric_min",
+            "weight_metric_max",
+            "life_span_min",
+            "life_span_max",
+            "adaptability",
+            "affection_level",
+            "child_friendly",
+            "dog_friendly",
+            "energy_level",
+            "grooming",
+            "health_issues",
+            "intelligence",
+            "shedding_level",
+            "social_needs",
+            "stranger_friendly",
+            "vocalisation",
+            "indoor",
+            "experimental",
+            "hairless",
+            "natural",
+            "rare",
+            "rex",
+            "suppressed_tail",
+            "short_legs",
+            "hypoallergenic",
+            "image",
+            "likes",
+            "hates",
+            "version",
+            "updated_at",
+        ]
+
+
+class BreedSearchSerializer(serializers.ModelSerializer):
+    """A breed found by ``search_breeds()``, with the HTML of its headline."""
+
+    rank = serializers.FloatField(read_only=True)
+    headline = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Breed
+        fields = ["id", "external_id", "name", "rank", "headline"]
+
+    def get_headline(self, obj):
+        return highlight(obj.headline)
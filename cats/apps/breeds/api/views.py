@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.middleware.http import ConditionalGetMiddleware
+from django.utils.decorators import decorator_from_middleware, method_decorator
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.viewsets import ReadOnlyModelViewSet
+
+from cats.apps.breeds.facets import get_facet_index
+from cats.apps.breeds.filters import BreedFilterForm
+from cats.apps.breeds.models import Breed, Image
+from cats.apps.breeds.search import search_breeds
+from cats.utils.renderers import ORJSONRenderer
+
+from .serializers import BreedSearchSerializer, BreedSerializer, ImageSerializer
+
+conditional_get = decorator_from_middleware(ConditionalGetMiddleware)
+
+
+class PkCursorPagination(CursorPagination):
+    """
+    Keyset pagination on the primary key: every page is an index range scan,
+    however deep the client pages, and rows inserted meanwhile do not shift it.
+    """
+
+    ordering = "pk"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+@method_decorator(conditional_get, name="dispatch")
+class SparseFieldsViewSet(ReadOnlyModelViewSet):
+    """
+    Read-only viewset accepting ``?fields=a,b`` to serialize only some fields;
+    the query then only loads the columns behind them.
+    """
+
+    permission_classes = [AllowAny]
+    pagination_class = PkCursorPagination
+    renderer_classes = [ORJSONRenderer]
+    # Relations followed with ``select_related()`` when their field is asked for.
+    related_fields = []
+    # Columns behind serializer fields that are not model fields of that name.
+    field_columns = {}
+
+    def requested_fields(self):
+        fields = self.request.query_params.get("fields")
+        if not fields:
+            return None
+        requested = [field for field in fields.split(",") if field]
+        allowed = self.serializer_class.Meta.fields
+        unknown = [field for field in requested if field not in allowed]
+        if unknown:
+            raise ValidationError({"fields": f"Unknown fields: {', '.join(unknown)}."})
+        return requested
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.requested_fields()
+        related = [
+            field for field in self.related_fields if fields is None or field in fields
+        ]
+        if related:
+            queryset = queryset.select_related(*related)
+        if fields is not None:
+            # The pk is always loaded; the cursor is built from it.
+            columns = {"id"}
+            for field in fields:
+                columns.update(self.field_columns.get(field, [field]))
+            queryset = queryset.only(*columns)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+
+class BreedViewSet(SparseFieldsViewSet):
+    """Breeds, narrowed down by the conditions of a ``BreedFilterForm``."""
+
+    serializer_class = BreedSerializer
+    queryset = Breed.objects.all()
+    related_fields = ["image"]
+
+    def filter_form(self):
+        form = BreedFilterForm(self.request.query_params)
+        if not form.is_valid():
+            raise ValidationError(form.errors)
+        return form
+
+    def get_queryset(self):
+        return self.filter_form().filter(super().get_queryset())
+
+    @action(detail=False)
+    def facets(self, request):
+        """Breeds matching the filters and the count of every facet value."""
+        return Response(get_facet_index().counts(self.filter_form().cleaned_data))
+
+    @action(detail=False)
+    def search(self, request):
+        """The best matches of ``q`` among the breeds matching the filters."""
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "This parameter is required."})
+        breeds = search_breeds(query, self.filter_form().filter(Breed.objects.all()))
+        serializer = BreedSearchSerializer(
+            breeds[: settings.CATS_BREEDS_SEARCH_LIMIT], many=True
+        )
+        return Response({"results": serializer.data})
+
+
+class ImageViewSet(SparseFieldsViewSet):
+    serializer_class = ImageSerializer
+    queryset = Image.objects.all()
+    field_columns = {"url": ["url", "image"]}
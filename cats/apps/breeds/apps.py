@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BreedsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "cats.apps.breeds"
+
+    def ready(self):
+        import cats.apps.breeds.signals  # noqa F401
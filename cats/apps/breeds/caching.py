@@ -0,0 +1,16 @@
+import time
+
+from django.core.cache import cache
+
+BREEDS_VERSION_KEY = "breeds:version"
+
+
+def breeds_version():
+    """Token that changes whenever any breed does, for keying cached pages."""
+    cache.add(BREEDS_VERSION_KEY, time.time_ns(), timeout=None)
+    return cache.get(BREEDS_VERSION_KEY)
+
+
+def invalidate_breeds():
+    """Retire every page cached under the current breeds version."""
+    cache.set(BREEDS_VERSION_KEY, time.time_ns(), timeout=None)
@@ -0,0 +1,124 @@
+import logging
+from functools import lru_cache
+
+import numpy as np
+
+from cats.apps.breeds.caching import breeds_version
+from cats.apps.breeds.models import BREED_CHARACTERISTICS, BREED_TRAITS, Breed
+
+logger = logging.getLogger(__name__)
+
+SCORES = range(1, 6)
+
+
+class FacetIndex:
+    """
+    The filterable columns of the breed catalog as NumPy arrays, answering
+    the conditions of a ``BreedFilterForm`` and the counts of every facet
+    value next to them without touching the database.
+
+    Missing scores are stored as 0, which no range matches.
+    """
+
+    def __init__(self, rows):
+        rows = list(rows)
+        self.pks = np.array([row[0] for row in rows], dtype=np.int64)
+        self.origin_names, self.origins = np.unique(
+            np.array([row[1] for row in rows], dtype=object), return_inverse=True
+        )
+        self.origin_codes = {name: code for code, name in enumerate(self.origin_names)}
+        self.characteristics = np.array([row[2] for row in rows], dtype=np.uint16)
+        self.traits = np.array(
+            [[score or 0 for score in row[3:]] for row in rows], dtype=np.uint8
+        ).reshape(len(rows), len(BREED_TRAITS))
+
+    @classmethod
+    def build(cls):
+        rows = Breed.objects.order_by("pk").values_list(
+            "pk", "origin", "characteristics", *BREED_TRAITS
+        )
+        index = cls(rows)
+        logger.info(f"Built facet index of {len(index.pks)} breeds.")
+        return index
+
+    def __len__(self):
+        return len(self.pks)
+
+    def conditions(self, filters):
+        """
+        Row masks of the conditions in ``filters`` (cleaned data of a
+        ``BreedFilterForm``), by the facet each restricts.
+        """
+        conditions = {}
+        origin = filters.get("origin")
+        if origin:
+            code = self.origin_codes.get(origin, -1)
+            conditions["origin"] = self.origins == code
+        for column, trait in enumerate(BREED_TRAITS):
+            low, high = filters.get(f"{trait}_min"), filters.get(f"{trait}_max")
+            if low is not None or high is not None:
+                scores = self.traits[:, column]
+                conditions[trait] = (scores >= (low or SCORES.start)) & (
+                    scores <= (high or SCORES.stop - 1)
+                )
+        for bit, name in enumerate(BREED_CHARACTERISTICS):
+            if filters.get(name):
+                conditions[name] = (self.characteristics >> bit) & 1 == 1
+        return conditions
+
+    def search(self, filters):
+        """Pks of the breeds matching ``filters``, in order."""
+        match = np.ones(len(self), dtype=bool)
+        for condition in self.conditions(filters).values():
+            match &= condition
+        return self.pks[match]
+
+    def counts(self, filters):
+        """
+        Breeds matching ``filters`` and, for every facet value, how many would
+        if that facet's own condition were lifted: the counts a filter sidebar
+        shows next to each value.
+
+        Conditions are stacked so counting the ones each row fails gives
+        every "all but one" match in a single pass.
+        """
+        conditions = self.conditions(filters)
+        failed = np.zeros(len(self), dtype=np.uint8)
+        for condition in conditions.values():
+            failed += ~condition
+        match = failed == 0
+
+        def match_without(facet):
+            if facet not in conditions:
+                return match
+            return match | ((failed == 1) & ~conditions[facet])
+
+        origins = np.bincount(
+            self.origins[match_without("origin")], minlength=len(self.origin_names)
+        )
+        facets = {
+            "origin": {
+                name: int(count)
+                for name, count in zip(self.origin_names, origins)
+                if name and count
+            }
+        }
+        for column, trait in enumerate(BREED_TRAITS):
+            scores = np.bincount(
+                self.traits[match_without(trait), column], minlength=SCORES.stop
+            )
+            facets[trait] = {score: int(scores[score]) for score in SCORES}
+        for bit, name in enumerate(BREED_CHARACTERISTICS):
+            having = (self.characteristics[match_without(name)] >> bit) & 1
+            facets[name] = int(having.sum())
+        return {"count": int(match.sum()), "facets": facets}
+
+
+@lru_cache(maxsize=1)
+def facet_index(version):
+    return FacetIndex.build()
+
+
+def get_facet_index():
+    """The facet index of the current catalog, rebuilt whenever it changes."""
+    return facet_index(breeds_version())
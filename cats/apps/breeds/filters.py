@@ -0,0 +1,86 @@
+from django import forms
+from django.db.models import Q
+from django.utils.http import urlencode
+
+from cats.apps.breeds.models import BREED_CHARACTERISTICS, BREED_TRAITS
+
+
+class BreedFilterForm(forms.Form):
+    """
+    Origin, trait ranges and required characteristics, e.g.
+    ``?energy_level_min=4&grooming_max=2&hypoallergenic=on``.
+
+    Every trait range is served by an index of its own (see ``Breed.Meta``),
+    which PostgreSQL combines with a BitmapAnd; the characteristics are
+    checked at once on their packed bitmask.
+    """
+
+    origin = forms.CharField(max_length=200, required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for trait in BREED_TRAITS:
+            for bound in ("min", "max"):
+                self.fields[f"{trait}_{bound}"] = forms.IntegerField(
+                    min_value=1, max_value=5, required=False
+                )
+        for characteristic in BREED_CHARACTERISTICS:
+            self.fields[characteristic] = forms.BooleanField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for trait in BREED_TRAITS:
+            low, high = cleaned_data.get(f"{trait}_min"), cleaned_data.get(
+                f"{trait}_max"
+            )
+            if low is not None and high is not None and low > high:
+                self.add_error(f"{trait}_max", "Must not be lower than the minimum.")
+        return cleaned_data
+
+    def trait_fields(self):
+        """``(trait, label, min field, max field)`` of every trait, for templates."""
+        return [
+            (
+                trait,
+                trait.replace("_", " ").capitalize(),
+                self[f"{trait}_min"],
+                self[f"{trait}_max"],
+            )
+            for trait in BREED_TRAITS
+        ]
+
+    def characteristic_fields(self):
+        return [self[characteristic] for characteristic in BREED_CHARACTERISTICS]
+
+    def active(self):
+        """The conditions set, by field name, in a stable order."""
+        return {
+            name: value
+            for name, value in sorted(self.cleaned_data.items())
+            if value not in (None, False, "")
+        }
+
+    def query_string(self):
+        """The conditions set as a canonical query string."""
+        return urlencode(
+            {
+                name: "on" if value is True else value
+                for name, value in self.active().items()
+            }
+        )
+
+    def condition(self):
+        """The origin and trait ranges set, as a ``Q``."""
+        conditions = Q()
+        for name, value in self.active().items():
+            if name == "origin":
+                conditions &= Q(origin=value)
+            elif name.endswith("_min"):
+                conditions &= Q(**{f"{name[:-4]}__gte": value})
+            elif name.endswith("_max"):
+                conditions &= Q(**{f"{name[:-4]}__lte": value})
+        return conditions
+
+    def filter(self, queryset):
+        required = [name for name in BREED_CHARACTERISTICS if self.cleaned_data[name]]
+        return queryset.filter(self.condition()).with_characteristics(all_of=required)
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import logging
+import random
+
+from cats.apps.breeds.models import Image
+from cats.apps.breeds.variants import FORMAT_MIME_TYPES, image_url, supported_formats
+from cats.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_KEY = "random:current"
+# Width of the random-cats cards at 2x.
+MANIFEST_IMAGE_WIDTH = 1200
+# Superseded versions stay around this long for decks opened before a sync.
+MANIFEST_TIMEOUT = 7 * 24 * 60 * 60
+
+
+def ring_key(version):
+    return f"random:{version}:ring"
+
+
+def entries_key(version, fmt):
+    return f"random:{version}:{fmt}"
+
+
+def build_manifest(images, fmt):
+    """Deck entries as JSON by image pk, for browsers preferring ``fmt``."""
+    return {
+        image.pk: json.dumps(
+            {
+                "id": image.pk,
+                "url": image_url(image, MANIFEST_IMAGE_WIDTH, FORMAT_MIME_TYPES[fmt]),
+                "blurhash": image.blurhash,
+                "color": image.dominant_color,
+            },
+            separators=(",", ":"),
+        )
+        for image in images
+    }
+
+
+def publish_manifest():
+    """
+    Publish the random-cats deck to Redis and make it current.
+
+    The deck is a ring of image pks in shuffled order plus, for every served
+    format, a hash of the entries the browser renders. Versions are derived
+    from the content, so republishing the same images is a no-op, and a
+    page keeps reading the version it was rendered with after a sync
+    publishes another. Windows of the ring skip what each visitor has seen,
+    so they are not cacheable. Returns the metadata pages reference the
+    deck by.
+    """
+    images = list(Image.objects.exclude(image="").prefetch_related("variants"))
+    manifests = {fmt: build_manifest(images, fmt) for fmt in supported_formats()}
+    digest = hashlib.sha256()
+    for fmt, manifest in sorted(manifests.items()):
+        for pk in sorted(manifest):
+            digest.update(manifest[pk].encode())
+    version = digest.hexdigest()[:16]
+
+    ring = sorted(image.pk for image in images)
+    # Seeded by the version, so republishing the same content is a no-op.
+    random.Random(version).shuffle(ring)
+
+    pipe = get_redis().pipeline()
+    pipe.delete(ring_key(version))
+    if ring:
+        pipe.rpush(ring_key(version), *ring)
+        pipe.expire(ring_key(version), MANIFEST_TIMEOUT)
+    for fmt, manifest in manifests.items():
+        pipe.delete(entries_key(version, fmt))
+        if manifest:
+            pipe.hset(entries_key(version, fmt), mapping=manifest)
+            pipe.expire(entries_key(version, fmt), MANIFEST_TIMEOUT)
+    meta = {"version": version, "count": len(ring)}
+    pipe.hset(MANIFEST_KEY, mapping=meta)
+    pipe.execute()
+    logger.info(f"Published random deck {version} of {len(ring)} images.")
+    return meta
+
+
+def current_manifest():
+    """Metadata of the current deck, publishing one if there is none."""
+    meta = get_redis().hgetall(MANIFEST_KEY)
+    if not meta:
+        return publish_manifest()
+    return {"version": meta[b"version"].decode(), "count": int(meta[b"count"])}
+
+
+def in_deck(version, image_pk):
+    """Whether ``image_pk`` is part of deck ``version``."""
+    return bool(get_redis().hexists(entries_key(version, "jpeg"), image_pk))
+
+
+def deck_entries(version, fmt, pks):
+    """JSON entries of deck ``version`` for ``pks``, skipping unknown ones."""
+    entries = get_redis().hmget(entries_key(version, fmt), pks) if pks else []
+    return [entry.decode() for entry in entries if entry is not None]
+
+
+def ring_window(redis, ring, start, count, size):
+    """``count`` pks of ``ring`` from ``start``, wrapping around."""
+    start %= size
+    pks = redis.lrange(ring, start, start + count - 1)
+    if len(pks) < count:
+        pks += redis.lrange(ring, 0, count - len(pks) - 1)
+    return [int(pk) for pk in pks]
+
+
+def sample(version, fmt, cursor, count, seen=None):
+    """
+    JSON entries of ``count`` images of the ring of deck ``version`` from
+    ``cursor`` on, wrapping around, and the cursor to continue from.
+
+    With a ``seen`` filter, images it already holds are skipped and the ones
+    returned are added to it; once the whole ring has been seen the filter
+    starts over. Returns ``None`` for unknown versions.
+    """
+    redis = get_redis()
+    ring = ring_key(version)
+    size = redis.llen(ring)
+    if not size and current_manifest()["version"] == version:
+        # The current deck expired or is empty; render it again.
+        size = publish_manifest()["count"]
+        if not size:
+            return [], cursor
+    if not size:
+        return None
+
+    count = min(count, size)
+    if seen is None:
+        pks = ring_window(redis, ring, cursor, count, size)
+        scanned = count
+    else:
+        pks, scanned = [], 0
+        while len(pks) < count and scanned < size:
+            candidates = ring_window(
+                redis, ring, cursor + scanned, min(2 * count, size - scanned), size
+            )
+            claimed = seen.claim(candidates, limit=count - len(pks))
+            pks += claimed
+            if len(pks) == count:
+                scanned += candidates.index(claimed[-1]) + 1
+            else:
+                scanned += len(candidates)
+        if not pks:
+            logger.info(f"Random deck {version} exhausted for {seen.key}.")
+            seen.clear()
+            pks = seen.claim(ring_window(redis, ring, cursor, count, size))
+            scanned = count
+
+    return deck_entries(version, fmt, pks), cursor + scanned
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.9 on 2026-10-18 17:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breeds', '0004_synccheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='breed',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='synccheckpoint',
+            name='seen_ids',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.0.9 on 2026-10-18 17:07
+
+import cats.apps.breeds.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breeds', '0006_image_size_checksum'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='image',
+            name='image',
+            field=models.ImageField(blank=True, upload_to=cats.apps.breeds.models.image_upload_to, verbose_name='image'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.0.9 on 2026-10-18 17:08
+
+import cats.apps.breeds.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breeds', '0007_image_content_addressed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('width', models.PositiveSmallIntegerField()),
+                ('height', models.PositiveSmallIntegerField()),
+                ('format', models.CharField(max_length=10)),
+                ('size', models.PositiveIntegerField()),
+                ('file', models.FileField(upload_to=cats.apps.breeds.models.variant_upload_to)),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='breeds.image')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='imagevariant',
+            constraint=models.UniqueConstraint(fields=('image', 'width', 'format'), name='unique_image_variant'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.9 on 2026-10-18 17:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breeds', '0008_imagevariant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='blurhash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='dominant_color',
+            field=models.CharField(blank=True, max_length=7),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.0.9 on 2026-10-18 17:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breeds', '0009_image_placeholders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='breed',
+            name='hates',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='breed',
+            name='likes',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='hates',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='likes',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
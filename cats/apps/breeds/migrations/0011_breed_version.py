@@ -0,0 +1,23 @@
+# Generated by Django 4.0.9 on 2026-10-18 17:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breeds', '0010_votes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='breed',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='breed',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 4.0.9 on 2026-10-18 17:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breeds', '0011_breed_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['adaptability'], name='breed_adaptability_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['affection_level'], name='breed_affection_level_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['child_friendly'], name='breed_child_friendly_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['dog_friendly'], name='breed_dog_friendly_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['energy_level'], name='breed_energy_level_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['grooming'], name='breed_grooming_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['health_issues'], name='breed_health_issues_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['intelligence'], name='breed_intelligence_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['shedding_level'], name='breed_shedding_level_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['social_needs'], name='breed_social_needs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['stranger_friendly'], name='breed_stranger_friendly_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['vocalisation'], name='breed_vocalisation_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('indoor', True)), fields=['id'], name='breed_indoor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('experimental', True)), fields=['id'], name='breed_experimental_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('hairless', True)), fields=['id'], name='breed_hairless_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('natural', True)), fields=['id'], name='breed_natural_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('rare', True)), fields=['id'], name='breed_rare_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('rex', True)), fields=['id'], name='breed_rex_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('suppressed_tail', True)), fields=['id'], name='breed_suppressed_tail_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('short_legs', True)), fields=['id'], name='breed_short_legs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('hypoallergenic', True)), fields=['id'], name='breed_hypoallergenic_idx'),
+        ),
+    ]
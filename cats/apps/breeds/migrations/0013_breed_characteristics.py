@@ -0,0 +1,82 @@
+# Generated by Django 4.0.9 on 2026-10-18 17:31
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+CHARACTERISTICS = [
+    "indoor",
+    "experimental",
+    "hairless",
+    "natural",
+    "rare",
+    "rex",
+    "suppressed_tail",
+    "short_legs",
+    "hypoallergenic",
+]
+
+
+def pack_characteristics(apps, schema_editor):
+    Breed = apps.get_model("breeds", "Breed")
+    Breed.objects.update(
+        characteristics=sum(
+            Case(When(**{name: True}, then=Value(1 << bit)), default=Value(0))
+            for bit, name in enumerate(CHARACTERISTICS)
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breeds', '0012_breed_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='breed',
+            name='breed_indoor_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='breed',
+            name='breed_experimental_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='breed',
+            name='breed_hairless_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='breed',
+            name='breed_natural_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='breed',
+            name='breed_rare_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='breed',
+            name='breed_rex_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='breed',
+            name='breed_suppressed_tail_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='breed',
+            name='breed_short_legs_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='breed',
+            name='breed_hypoallergenic_idx',
+        ),
+        migrations.AddField(
+            model_name='breed',
+            name='characteristics',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(pack_characteristics, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['characteristics'], name='breed_characteristics_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.0.9 on 2026-10-18 17:35
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+class AddPostgresIndex(migrations.AddIndex):
+    """GIN indexes only exist on PostgreSQL; elsewhere only the state changes."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def fill_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Breed = apps.get_model("breeds", "Breed")
+    Breed.objects.update(
+        search_vector=SearchVector("name", "alt_names", weight="A", config="english")
+        + SearchVector("temperament", weight="B", config="english")
+        + SearchVector("description", weight="C", config="english")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breeds', '0013_breed_characteristics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='breed',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        AddPostgresIndex(
+            model_name='breed',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='breed_search_idx'),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.0.9 on 2026-10-18 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breeds', '0015_votebatch'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('indoor', True)), fields=['characteristics'], name='breed_indoor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('experimental', True)), fields=['characteristics'], name='breed_experimental_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('hairless', True)), fields=['characteristics'], name='breed_hairless_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('natural', True)), fields=['characteristics'], name='breed_natural_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('rare', True)), fields=['characteristics'], name='breed_rare_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('rex', True)), fields=['characteristics'], name='breed_rex_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('suppressed_tail', True)), fields=['characteristics'], name='breed_suppressed_tail_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('short_legs', True)), fields=['characteristics'], name='breed_short_legs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(condition=models.Q(('hypoallergenic', True)), fields=['characteristics'], name='breed_hypoallergenic_idx'),
+        ),
+    ]
@@ -1,21 +1,167 @@
 import logging
+import os
 
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import connection, models
+from django.db.models import F, Q
 
 logger = logging.getLogger(__name__)
 
+# Temperament scores, 1 to 5.
+BREED_TRAITS = [
+    "adaptability",
+    "affection_level",
+    "child_friendly",
+    "dog_friendly",
+    "energy_level",
+    "grooming",
+    "health_issues",
+    "intelligence",
+    "shedding_level",
+    "social_needs",
+    "stranger_friendly",
+    "vocalisation",
+]
+BREED_CHARACTERISTICS = [
+    "indoor",
+    "experimental",
+    "hairless",
+    "natural",
+    "rare",
+    "rex",
+    "suppressed_tail",
+    "short_legs",
+    "hypoallergenic",
+]
+
+# Text configuration of the breed search; stems "playful" and "play" alike.
+SEARCH_CONFIG = "english"
+# Weighted so matches on names outrank matches deep in a description.
+BREED_SEARCH_VECTOR = (
+    SearchVector("name", "alt_names", weight="A", config=SEARCH_CONFIG)
+    + SearchVector("temperament", weight="B", config=SEARCH_CONFIG)
+    + SearchVector("description", weight="C", config=SEARCH_CONFIG)
+)
+
+
+def characteristics_mask(names):
+    """Bits of ``Breed.characteristics`` standing for the characteristics ``names``."""
+    mask = 0
+    for name in names:
+        mask |= 1 << BREED_CHARACTERISTICS.index(name)
+    return mask
+
+
+def image_upload_to(instance, filename):
+    """
+    Store images under their content hash, e.g. ``images/ab/cd/abcd….jpg``,
+    so identical bytes map to a single file. Falls back to the original
+    filename when the checksum is unknown.
+    """
+    if not instance.checksum:
+        return f"images/{filename}"
+    extension = os.path.splitext(filename)[1].lower()
+    checksum = instance.checksum
+    return f"images/{checksum[:2]}/{checksum[2:4]}/{checksum}{extension}"
+
+
+def variant_upload_to(instance, filename):
+    checksum = instance.image.checksum
+    if not checksum:
+        return f"variants/{filename}"
+    return f"variants/{checksum[:2]}/{checksum[2:4]}/{filename}"
+
 
 class Image(models.Model):
     external_id = models.CharField(max_length=200, unique=True)
     width = models.PositiveSmallIntegerField()
     height = models.PositiveSmallIntegerField()
     url = models.CharField(max_length=200, blank=True)
-    image = models.ImageField(verbose_name="image", upload_to="images", blank=True)
+    image = models.ImageField(
+        verbose_name="image", upload_to=image_upload_to, blank=True
+    )
+    # Size in bytes and sha256 hex digest of the stored file.
+    size = models.PositiveIntegerField(null=True, blank=True)
+    checksum = models.CharField(max_length=64, blank=True)
+    # Placeholders rendered inline while the image loads.
+    blurhash = models.CharField(max_length=64, blank=True)
+    dominant_color = models.CharField(max_length=7, blank=True)
+    # Swipes on the random-cats deck, flushed from Redis periodically.
+    likes = models.PositiveIntegerField(default=0, editable=False)
+    hates = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return f"{self.external_id}"
 
 
+class ImageVariant(models.Model):
+    """Resized and re-encoded derivative of an ``Image``."""
+
+    image = models.ForeignKey(Image, related_name="variants", on_delete=models.CASCADE)
+    width = models.PositiveSmallIntegerField()
+    height = models.PositiveSmallIntegerField()
+    format = models.CharField(max_length=10)
+    size = models.PositiveIntegerField()
+    file = models.FileField(upload_to=variant_upload_to)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["image", "width", "format"], name="unique_image_variant"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.image} - {self.width}w {self.format}"
+
+
+class BreedQuerySet(models.QuerySet):
+    def with_characteristics(self, all_of=(), any_of=(), none_of=()):
+        """
+        Breeds having every characteristic of ``all_of``, at least one of
+        ``any_of`` and none of ``none_of``, each tested with a single bitwise
+        predicate on ``characteristics``.
+
+        Having all the bits of a mask, or any of them, implies a lower bound
+        on the packed value, which is added so the index has a range to scan.
+        That range is only narrow for high bits, so required characteristics
+        are also matched on their own columns; see below.
+        """
+        queryset = self
+        if all_of:
+            mask = characteristics_mask(all_of)
+            queryset = queryset.alias(
+                characteristics_all=F("characteristics").bitand(mask)
+            ).filter(
+                characteristics_all=mask,
+                characteristics__gte=mask,
+                # Redundant with the bitwise test, on purpose: the planner
+                # only uses the partial index of a characteristic for a query
+                # that repeats its condition, and without one a low bit such
+                # as indoor's is a sequential scan.
+                **{name: True for name in all_of},
+            )
+        if any_of:
+            mask = characteristics_mask(any_of)
+            queryset = queryset.alias(
+                characteristics_any=F("characteristics").bitand(mask)
+            ).filter(characteristics_any__gt=0, characteristics__gte=mask & -mask)
+        if none_of:
+            mask = characteristics_mask(none_of)
+            queryset = queryset.alias(
+                characteristics_none=F("characteristics").bitand(mask)
+            ).filter(characteristics_none=0)
+        return queryset
+
+    def update_search_vector(self):
+        """Recompute ``search_vector`` of these breeds in one statement."""
+        if connection.vendor != "postgresql":
+            # Other databases search with the fallback of search_breeds().
+            return 0
+        return self.update(search_vector=BREED_SEARCH_VECTOR)
+
+
 class Breed(models.Model):
     external_id = models.CharField(max_length=200, unique=True)
     name = models.CharField(max_length=200)
@@ -60,34 +206,102 @@ class Breed(models.Model):
     suppressed_tail = models.BooleanField(null=True, blank=True)
     short_legs = models.BooleanField(null=True, blank=True)
     hypoallergenic = models.BooleanField(null=True, blank=True)
+    # The characteristics above packed one bit each, in BREED_CHARACTERISTICS
+    # order; see BreedQuerySet.with_characteristics().
+    characteristics = models.PositiveSmallIntegerField(default=0, editable=False)
+    # BREED_SEARCH_VECTOR, refreshed by the sync and on save().
+    search_vector = SearchVectorField(null=True, editable=False)
 
     reference_image_id = models.CharField(max_length=200, blank=True)
     image = models.ForeignKey(
         Image, related_name="breeds", on_delete=models.SET_NULL, null=True, blank=True
     )
+    # Fingerprint of the upstream payload the row was last synced from.
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+    # Bumped on every change, for conditional requests and cached fragments.
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Swipes on the breed's reference image, flushed from Redis periodically.
+    likes = models.PositiveIntegerField(default=0, editable=False)
+    hates = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = BreedQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Any combination of trait ranges is answered by ANDing the
+            # bitmaps of these; a composite index would only serve its prefix.
+            *(
+                models.Index(fields=[trait], name=f"breed_{trait}_idx")
+                for trait in BREED_TRAITS
+            ),
+            # Range scanned on the lower bounds of characteristic filters.
+            models.Index(fields=["characteristics"], name="breed_characteristics_idx"),
+            # Only the breeds having each characteristic, whatever its bit.
+            *(
+                models.Index(
+                    fields=["characteristics"],
+                    condition=Q(**{name: True}),
+                    name=f"breed_{name}_idx",
+                )
+                for name in BREED_CHARACTERISTICS
+            ),
+            GinIndex(fields=["search_vector"], name="breed_search_idx"),
+        ]
 
     def __str__(self):
         return f"{self.external_id} - {self.name}"
 
-    def save(self, **kwargs):
-        old_reference_image_id = None
-        if self.pk:
-            old_reference_image_id = self.reference_image_id
+    def pack_characteristics(self):
+        return characteristics_mask(
+            name for name in BREED_CHARACTERISTICS if getattr(self, name)
+        )
 
+    def save(self, **kwargs):
+        # Local edits no longer match upstream; let the next sync rewrite them.
+        self.content_hash = ""
+        self.characteristics = self.pack_characteristics()
+        bump_version = self.pk is not None
+        if bump_version:
+            # In the database: the sync and variant tasks may have bumped it
+            # since this instance was loaded.
+            self.version = F("version") + 1
+        if not self.reference_image_id:
+            self.image = None
+        elif self.image is None or self.image.external_id != self.reference_image_id:
+            self.image = Image.objects.filter(
+                external_id=self.reference_image_id
+            ).first()
+            if self.image is None:
+                logger.warning(
+                    f"Image with external ID {self.reference_image_id} not found!"
+                )
         super().save(**kwargs)
-        if old_reference_image_id != self.reference_image_id or (
-            self.reference_image_id and not self.image
-        ):
-            if self.reference_image_id:
-                try:
-                    image = Image.objects.get(external_id=self.reference_image_id)
-                except Image.DoesNotExist:
-                    logger.warning(
-                        f"Image with external ID {self.reference_image_id} not found!"
-                    )
-                    pass
-                else:
-                    self.image = image
-            else:
-                self.image = None
-        return super().save()
+        if bump_version:
+            self.refresh_from_db(fields=["version"])
+        Breed.objects.filter(pk=self.pk).update_search_vector()
+
+
+class SyncCheckpoint(models.Model):
+    """Progress of a paged sync, so a killed run resumes where it stopped."""
+
+    name = models.CharField(max_length=200, unique=True)
+    # Next upstream page to sync.
+    page = models.PositiveIntegerField(default=0)
+    pending_image_ids = models.JSONField(default=list, blank=True)
+    # External IDs of the breeds synced so far, for removing the rest.
+    seen_ids = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} - page {self.page}"
+
+
+class VoteBatch(models.Model):
+    """A flushed batch of buffered votes, so a replayed flush is a no-op."""
+
+    batch_id = models.CharField(max_length=32, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.batch_id
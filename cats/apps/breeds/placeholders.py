@@ -0,0 +1,116 @@
+import logging
+
+import numpy as np
+from PIL import Image as PILImage
+from PIL import ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+# Side of the thumbnail the placeholders are computed from; blurhash only
+# keeps a handful of frequencies, so more pixels would not change it.
+SAMPLE_SIZE = 64
+
+
+def base83(value, length):
+    digits = []
+    for _ in range(length):
+        value, digit = divmod(value, 83)
+        digits.append(BASE83[digit])
+    return "".join(reversed(digits))
+
+
+def srgb_to_linear(values):
+    values = values / 255
+    return np.where(
+        values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4
+    )
+
+
+def linear_to_srgb(value):
+    value = min(max(value, 0), 1)
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(pixels, components_x=4, components_y=3):
+    """Blurhash string of an ``(height, width, 3)`` uint8 RGB array."""
+    height, width, _ = pixels.shape
+    linear = srgb_to_linear(pixels.astype(np.float64))
+
+    # Cosine basis for every component along each axis, then all component
+    # factors at once: factors[j, i] is the mean colour weighted by basis (i, j).
+    basis_x = np.cos(
+        np.pi * np.outer(np.arange(components_x), np.arange(width)) / width
+    )
+    basis_y = np.cos(
+        np.pi * np.outer(np.arange(components_y), np.arange(height)) / height
+    )
+    factors = np.einsum("jy,ix,yxc->jic", basis_y, basis_x, linear) / (width * height)
+    factors[1:] *= 2
+    factors[0, 1:] *= 2
+
+    factors = factors.reshape(-1, 3)
+    dc, ac = factors[0], factors[1:]
+
+    result = base83((components_x - 1) + (components_y - 1) * 9, 1)
+    if len(ac):
+        quantised_max = int(max(0, min(82, np.floor(np.abs(ac).max() * 166 - 0.5))))
+        maximum = (quantised_max + 1) / 166
+    else:
+        quantised_max, maximum = 0, 1
+    result += base83(quantised_max, 1)
+
+    r, g, b = (linear_to_srgb(channel) for channel in dc)
+    result += base83((r << 16) + (g << 8) + b, 4)
+
+    scaled = np.sign(ac) * np.abs(ac / maximum) ** 0.5
+    quantised = np.clip(np.floor(scaled * 9 + 9.5), 0, 18).astype(int)
+    for qr, qg, qb in quantised:
+        result += base83(int(qr * 19 * 19 + qg * 19 + qb), 2)
+    return result
+
+
+def dominant_color(pixels, bits=4):
+    """
+    Hex colour of the most common hue of an ``(height, width, 3)`` array.
+
+    Pixels are bucketed on the top ``bits`` of each channel; the answer is the
+    mean colour of the fullest bucket.
+    """
+    pixels = pixels.reshape(-1, 3).astype(np.int64)
+    shift = 8 - bits
+    buckets = pixels >> shift
+    keys = (buckets[:, 0] << (2 * bits)) | (buckets[:, 1] << bits) | buckets[:, 2]
+    mode = np.bincount(keys).argmax()
+    r, g, b = pixels[keys == mode].mean(axis=0).round().astype(int)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def sample_pixels(source):
+    sample = source.convert("RGB")
+    sample.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE), PILImage.Resampling.BILINEAR)
+    return np.asarray(sample)
+
+
+def compute_placeholders(image):
+    """
+    Fill in the ``blurhash`` and ``dominant_color`` of a stored ``image``.
+
+    Returns whether the placeholders could be computed; the caller saves.
+    """
+    if not image.image:
+        return False
+    try:
+        with image.image.open("rb") as f:
+            source = ImageOps.exif_transpose(PILImage.open(f))
+            pixels = sample_pixels(source)
+    except (OSError, UnidentifiedImageError):
+        logger.warning(f"Image {image.external_id} could not be decoded.")
+        return False
+
+    image.blurhash = blurhash(pixels)
+    image.dominant_color = dominant_color(pixels)
+    return True
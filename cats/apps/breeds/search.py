@@ -0,0 +1,68 @@
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Left
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from cats.apps.breeds.models import SEARCH_CONFIG, Breed
+
+# Columns BREED_SEARCH_VECTOR is made of, for the substring fallback.
+SEARCH_FIELDS = ["name", "alt_names", "temperament", "description"]
+# Delimiters of the matches in headlines, turned into <mark>s by highlight()
+# once the rest is escaped.
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+HEADLINE_LENGTH = 200
+
+
+def search_breeds(query, queryset=None):
+    """
+    Breeds matching ``query`` (web search syntax: words, "phrases", -word,
+    or), best first, annotated with their ``rank`` and a ``headline`` of
+    their description around the matches.
+
+    On PostgreSQL the GIN index on ``Breed.search_vector`` finds them. Other
+    databases, SQLite in tests for instance, fall back to unranked substring
+    matches on the same columns.
+    """
+    queryset = Breed.objects.all() if queryset is None else queryset
+    if connection.vendor != "postgresql":
+        matches = Q()
+        for field in SEARCH_FIELDS:
+            matches |= Q(**{f"{field}__icontains": query})
+        return (
+            queryset.filter(matches)
+            .annotate(
+                rank=Value(0.0, output_field=FloatField()),
+                headline=Left("description", HEADLINE_LENGTH),
+            )
+            .order_by("name", "pk")
+        )
+
+    search = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+    return (
+        queryset.filter(search_vector=search)
+        .annotate(
+            rank=SearchRank(F("search_vector"), search),
+            headline=SearchHeadline(
+                "description",
+                search,
+                config=SEARCH_CONFIG,
+                start_sel=HIGHLIGHT_START,
+                stop_sel=HIGHLIGHT_STOP,
+                max_words=35,
+                min_words=15,
+            ),
+        )
+        .order_by("-rank", "pk")
+    )
+
+
+def highlight(headline):
+    """HTML of a search headline, with its matches in ``<mark>``."""
+    return mark_safe(
+        escape(headline or "")
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_STOP, "</mark>")
+    )
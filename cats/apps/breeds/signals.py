@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from cats.apps.breeds.caching import invalidate_breeds
+from cats.apps.breeds.models import Breed
+
+
+@receiver(post_save, sender=Breed)
+@receiver(post_delete, sender=Breed)
+def breed_changed(sender, **kwargs):
+    # Bulk writes from the sync send no signals; it invalidates by itself.
+    transaction.on_commit(invalidate_breeds)
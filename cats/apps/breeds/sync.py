@@ -0,0 +1,480 @@
+import hashlib
+import json
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from itertools import islice
+from tempfile import SpooledTemporaryFile
+
+import requests
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from cats.apps.breeds.caching import invalidate_breeds
+from cats.apps.breeds.models import Breed, Image
+
+logger = logging.getLogger(__name__)
+
+# Every column written by the sync, used for ``bulk_update``.
+BREED_SYNC_FIELDS = [
+    "name",
+    "description",
+    "alt_names",
+    "origin",
+    "country_code",
+    "vetstreet_url",
+    "wikipedia_url",
+    "weight_imperial_min",
+    "weight_imperial_max",
+    "weight_metric_min",
+    "weight_metric_max",
+    "life_span_min",
+    "life_span_max",
+    "temperament",
+    "adaptability",
+    "affection_level",
+    "child_friendly",
+    "dog_friendly",
+    "energy_level",
+    "grooming",
+    "health_issues",
+    "intelligence",
+    "shedding_level",
+    "social_needs",
+    "stranger_friendly",
+    "vocalisation",
+    "indoor",
+    "experimental",
+    "hairless",
+    "natural",
+    "rare",
+    "rex",
+    "suppressed_tail",
+    "short_legs",
+    "hypoallergenic",
+    "characteristics",
+    "reference_image_id",
+    "image",
+    "content_hash",
+]
+
+# Columns whose upstream values make up a breed's content fingerprint.
+BREED_HASH_FIELDS = [
+    name
+    for name in BREED_SYNC_FIELDS
+    if name not in ("characteristics", "image", "content_hash")
+]
+
+NEW, CHANGED, UNCHANGED = "new", "changed", "unchanged"
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+SyncStats = namedtuple("SyncStats", ["created", "updated", "unchanged"])
+
+
+def parse_range(value):
+    """Split an upstream ``"min - max"`` string into two integers."""
+    low, high = value.split(" - ")
+    return int(low), int(high)
+
+
+def parse_breed(breed):
+    """Build an unsaved ``Breed`` instance from an upstream breed payload."""
+    obj = Breed(external_id=breed["id"])
+
+    obj.name = breed["name"]
+    obj.description = breed["description"]
+    obj.alt_names = breed.get("alt_names", "")
+    obj.origin = breed.get("origin", "")
+    obj.country_code = breed.get("country_code", "")
+    obj.vetstreet_url = breed.get("vetstreet_url", "")
+    obj.wikipedia_url = breed.get("wikipedia_url", "")
+
+    # weight
+    obj.weight_imperial_min, obj.weight_imperial_max = parse_range(
+        breed["weight"]["imperial"]
+    )
+    obj.weight_metric_min, obj.weight_metric_max = parse_range(
+        breed["weight"]["metric"]
+    )
+
+    # lifespan
+    obj.life_span_min, obj.life_span_max = parse_range(breed["life_span"])
+
+    # temperament
+    obj.temperament = breed["temperament"]
+    obj.adaptability = breed["adaptability"]
+    obj.affection_level = breed["affection_level"]
+    obj.child_friendly = breed["child_friendly"]
+    obj.dog_friendly = breed["dog_friendly"]
+    obj.energy_level = breed["energy_level"]
+    obj.grooming = breed["grooming"]
+    obj.health_issues = breed["health_issues"]
+    obj.intelligence = breed["intelligence"]
+    obj.shedding_level = breed["shedding_level"]
+    obj.social_needs = breed["social_needs"]
+    obj.stranger_friendly = breed["stranger_friendly"]
+    obj.vocalisation = breed["vocalisation"]
+
+    # characteristics
+    obj.indoor = bool(breed["indoor"])
+    obj.experimental = bool(breed["experimental"])
+    obj.hairless = bool(breed["hairless"])
+    obj.natural = bool(breed["natural"])
+    obj.rare = bool(breed["rare"])
+    obj.rex = bool(breed["rex"])
+    obj.suppressed_tail = bool(breed["suppressed_tail"])
+    obj.short_legs = bool(breed["short_legs"])
+    obj.hypoallergenic = bool(breed["hypoallergenic"])
+    obj.characteristics = obj.pack_characteristics()
+
+    # image
+    obj.reference_image_id = breed.get("reference_image_id") or ""
+    return obj
+
+
+def chunked(items, size):
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def breed_fingerprint(obj):
+    """Hash the normalized upstream content of a parsed breed."""
+    content = {name: getattr(obj, name) for name in BREED_HASH_FIELDS}
+    payload = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def diff_breeds(objs):
+    """
+    Classify parsed breeds against the stored rows with one indexed read.
+
+    Returns a dict mapping ``NEW``, ``CHANGED`` and ``UNCHANGED`` to lists of
+    breeds; changed breeds get the primary key of their stored row. A breed
+    whose reference image was missing when it was stored counts as changed
+    so the image gets linked once it is available.
+    """
+    existing = {
+        external_id: (pk, content_hash, image_id)
+        for external_id, pk, content_hash, image_id in Breed.objects.filter(
+            external_id__in=[obj.external_id for obj in objs]
+        ).values_list("external_id", "pk", "content_hash", "image_id")
+    }
+
+    diff = {NEW: [], CHANGED: [], UNCHANGED: []}
+    for obj in objs:
+        obj.content_hash = breed_fingerprint(obj)
+        if obj.external_id not in existing:
+            diff[NEW].append(obj)
+            continue
+
+        obj.pk, content_hash, image_id = existing[obj.external_id]
+        if content_hash != obj.content_hash or (
+            obj.reference_image_id and image_id is None
+        ):
+            diff[CHANGED].append(obj)
+        else:
+            diff[UNCHANGED].append(obj)
+    return diff
+
+
+def upsert_breeds(breeds, chunk_size=None):
+    """
+    Insert or update upstream breed payloads in bulk.
+
+    Each chunk runs in its own transaction. Unchanged breeds cost nothing
+    beyond the diff read; otherwise a chunk adds an image lookup, one insert
+    and the read of its keys, one update and one refresh of the search
+    vectors regardless of its size. Inserts skip breeds a concurrent sync
+    stored first, updating them instead when they differ.
+    Returns ``SyncStats``.
+    """
+    chunk_size = chunk_size or settings.CATS_SYNC_CHUNK_SIZE
+    # Upstream pages may overlap; keep the last payload for each breed.
+    breeds = list({breed["id"]: breed for breed in breeds}.values())
+    stats = SyncStats(0, 0, 0)
+    for chunk in chunked(breeds, chunk_size):
+        objs = [parse_breed(breed) for breed in chunk]
+        with transaction.atomic():
+            diff = diff_breeds(objs)
+            _write_changes(diff[NEW], diff[CHANGED])
+            if diff[NEW] or diff[CHANGED]:
+                transaction.on_commit(invalidate_breeds)
+        stats = SyncStats(
+            stats.created + len(diff[NEW]),
+            stats.updated + len(diff[CHANGED]),
+            stats.unchanged + len(diff[UNCHANGED]),
+        )
+    logger.info(
+        f"Upserted breeds: {stats.created} created, {stats.updated} updated, "
+        f"{stats.unchanged} unchanged."
+    )
+    return stats
+
+
+def _write_changes(to_create, to_update):
+    if not to_create and not to_update:
+        return
+
+    image_ids = {
+        obj.reference_image_id
+        for obj in to_create + to_update
+        if obj.reference_image_id
+    }
+    images = dict(
+        Image.objects.filter(external_id__in=image_ids).values_list("external_id", "pk")
+    )
+    for obj in to_create + to_update:
+        obj.image_id = images.get(obj.reference_image_id)
+        if obj.reference_image_id and obj.image_id is None:
+            logger.warning(
+                f"Image with external ID {obj.reference_image_id} not found!"
+            )
+
+    to_update = list(to_update)
+    if to_create:
+        Breed.objects.bulk_create(to_create, ignore_conflicts=True)
+        # Rows another sync inserted since the diff were skipped; read back
+        # every key and update the ones whose content differs from ours.
+        by_external_id = {obj.external_id: obj for obj in to_create}
+        for external_id, pk, content_hash in Breed.objects.filter(
+            external_id__in=by_external_id
+        ).values_list("external_id", "pk", "content_hash"):
+            obj = by_external_id[external_id]
+            obj.pk = pk
+            if content_hash != obj.content_hash:
+                to_update.append(obj)
+    if to_update:
+        # bulk_update skips auto_now; keep the version bookkeeping of save().
+        now = timezone.now()
+        for obj in to_update:
+            obj.updated_at = now
+            obj.version = F("version") + 1
+        Breed.objects.bulk_update(
+            to_update, BREED_SYNC_FIELDS + ["updated_at", "version"]
+        )
+    Breed.objects.filter(
+        pk__in=[obj.pk for obj in to_create + to_update]
+    ).update_search_vector()
+
+
+def remove_breeds(seen_ids):
+    """Delete, in one statement, every breed upstream no longer lists."""
+    if not seen_ids:
+        # An empty catalog is far more likely an upstream hiccup than reality.
+        logger.warning("No breeds seen upstream, skipping removal.")
+        return 0
+    # Nothing cascades from breeds, so skip the collector: a plain delete()
+    # would load every row to send the post_delete signals, each queueing
+    # its own invalidation.
+    stale = Breed.objects.exclude(external_id__in=seen_ids)
+    removed = stale._raw_delete(stale.db)
+    if removed:
+        transaction.on_commit(invalidate_breeds)
+        logger.info(f"Removed {removed} breeds no longer listed upstream.")
+    return removed
+
+
+def iter_breed_pages(client, start_page=0, limit=None):
+    """Yield ``(page, breeds)`` from the upstream API until a short page."""
+    limit = limit or settings.CATS_API_DATA_LIMIT
+    page = start_page
+    while True:
+        data = client.get_breeds(page=page, limit=limit)
+        yield page, data
+        if len(data) < limit:
+            break
+        page += 1
+
+
+def sync_breeds(client, checkpoint=None):
+    """
+    Sync the upstream catalog one page at a time.
+
+    Each page has its reference images fetched and its breeds upserted
+    before the next page is requested, so only one page is held in memory
+    and everything up to the last yielded page is committed. Yields
+    ``(page, count)`` after each page.
+
+    Once the last page is in, breeds that upstream no longer lists are
+    removed. With a ``SyncCheckpoint`` the sync starts from its page,
+    retries its pending images first and records progress (including the
+    breeds seen so far) after every step.
+    """
+    start_page = 0
+    seen_ids = set()
+    if checkpoint is not None:
+        start_page = checkpoint.page
+        seen_ids.update(checkpoint.seen_ids)
+        if checkpoint.pending_image_ids:
+            pending = set(checkpoint.pending_image_ids)
+            fetch_images(client, pending, on_stored=drop_pending(checkpoint, pending))
+            save_checkpoint(checkpoint, pending_image_ids=[])
+
+    for page, breeds in iter_breed_pages(client, start_page=start_page):
+        image_ids = {
+            obj["reference_image_id"]
+            for obj in breeds
+            if obj.get("reference_image_id", None)
+        }
+        on_stored = None
+        if checkpoint is not None:
+            save_checkpoint(checkpoint, pending_image_ids=sorted(image_ids))
+            on_stored = drop_pending(checkpoint, set(image_ids))
+        # Fetch image raw data on demand
+        fetch_images(client, image_ids, on_stored=on_stored)
+        upsert_breeds(breeds)
+        seen_ids.update(breed["id"] for breed in breeds)
+        if checkpoint is not None:
+            save_checkpoint(
+                checkpoint,
+                page=page + 1,
+                pending_image_ids=[],
+                seen_ids=sorted(seen_ids),
+            )
+        yield page, len(breeds)
+
+    remove_breeds(seen_ids)
+
+
+def save_checkpoint(checkpoint, **fields):
+    for name, value in fields.items():
+        setattr(checkpoint, name, value)
+    checkpoint.save(update_fields=[*fields, "updated_at"])
+
+
+def drop_pending(checkpoint, pending):
+    """Return an ``on_stored`` callback shrinking the checkpoint's pending images."""
+
+    def on_stored(image_ids):
+        pending.difference_update(image_ids)
+        save_checkpoint(checkpoint, pending_image_ids=sorted(pending))
+
+    return on_stored
+
+
+def fetch_images(client, image_ids, concurrency=None, batch_size=None, on_stored=None):
+    """
+    Download and store the images of ``image_ids`` not in the database yet.
+
+    Images are written in batches of ``batch_size`` as their downloads
+    finish, so an interrupted fetch keeps what it already has. ``on_stored``
+    is called with the IDs of every batch known to be stored.
+    """
+    if not image_ids:
+        return
+
+    existing_images = set(
+        Image.objects.filter(external_id__in=image_ids).values_list(
+            "external_id", flat=True
+        )
+    )
+    if existing_images and on_stored is not None:
+        on_stored(existing_images)
+    missing_images = image_ids - existing_images
+    logger.info(f"Missing image IDs: {missing_images}")
+
+    if not missing_images:
+        logger.info("No images to retrieve.")
+        return
+
+    concurrency = concurrency or settings.CATS_IMAGE_FETCH_CONCURRENCY
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    # Metadata lookups, downloads and storage uploads overlap in the pool;
+    # finished images are written from this thread a batch at a time. An
+    # image that fails is skipped, and retried by the next sync, without
+    # losing the rest.
+    batch_size = batch_size or settings.CATS_IMAGE_FETCH_BATCH_SIZE
+    objs = []
+    stored = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(fetch_image, client, session, image_id): image_id
+            for image_id in missing_images
+        }
+        try:
+            for future in as_completed(futures):
+                try:
+                    objs.append(future.result())
+                except Exception:
+                    logger.exception(f"Could not fetch image {futures[future]}.")
+                if len(objs) >= batch_size:
+                    stored += store_images(objs, on_stored)
+                    objs = []
+        except BaseException:
+            # Interrupted (e.g. by the soft time limit): don't start the rest.
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    stored += store_images(objs, on_stored)
+    logger.info(f"Stored {stored} images.")
+
+
+def store_images(objs, on_stored=None):
+    if not objs:
+        return 0
+    Image.objects.bulk_create(objs, ignore_conflicts=True)
+    if on_stored is not None:
+        on_stored({obj.external_id for obj in objs})
+    return len(objs)
+
+
+def fetch_image(client, session, image_id):
+    image = client.get_image(image_id)
+    obj = Image(
+        external_id=image["id"],
+        url=image["url"],
+        width=image["width"],
+        height=image["height"],
+    )
+    url = image["url"]
+    logger.info(f"Fetching raw image data: {url}")
+
+    with session.get(url, stream=True) as response:
+        # A row without its file would never be fetched again; fail instead,
+        # so fetch_images() skips it and the next sync retries.
+        response.raise_for_status()
+
+        filename = url.split("/")[-1]
+        logger.info(f"Saving image raw data in file: {filename}")
+        with download_to_spool(response) as (spool, size, checksum):
+            obj.size = size
+            obj.checksum = checksum
+            name = obj.image.field.generate_filename(obj, filename)
+            if obj.image.storage.exists(name):
+                # Same bytes already stored under their content hash.
+                logger.info(f"Image data already stored in file: {name}")
+                obj.image.name = name
+            else:
+                obj.image.save(filename, File(spool), save=False)
+    return obj
+
+
+@contextmanager
+def download_to_spool(response):
+    """
+    Stream a response body into a temporary file, hashing it on the way.
+
+    Bodies up to ``CATS_IMAGE_SPOOL_SIZE`` stay in memory, larger ones spill
+    to disk, so a download never holds more than one bounded buffer. Yields
+    the rewound file, its size and its sha256 hex digest.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with SpooledTemporaryFile(max_size=settings.CATS_IMAGE_SPOOL_SIZE) as spool:
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            spool.write(chunk)
+            digest.update(chunk)
+            size += len(chunk)
+        spool.seek(0)
+        yield spool, size, digest.hexdigest()
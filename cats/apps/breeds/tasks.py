@@ -1,131 +1,139 @@
-import base64
 import logging
 
-import requests
+from celery import chord
+from celery.exceptions import SoftTimeLimitExceeded
 from django.conf import settings
-from django.core.files.base import ContentFile
-
-from cats.apps.breeds.models import Breed, Image
-from cats.utils.client import CatsAPIClient
+from django.core.cache import caches
+from django.db.models import F, Q
+from django.utils import timezone
+from django_redis import get_redis_connection
+from django_redis.cache import RedisCache
+
+from cats.apps.breeds import votes
+from cats.apps.breeds.manifest import publish_manifest
+from cats.apps.breeds.models import Breed, Image, SyncCheckpoint
+from cats.apps.breeds.placeholders import compute_placeholders
+from cats.apps.breeds.sync import sync_breeds
+from cats.apps.breeds.variants import generate_variants
+from cats.utils.client import CatsAPIClient, RedisLRUIndex
+from cats.utils.ratelimit import get_rate_limiter
 from config import celery_app
 
 logger = logging.getLogger(__name__)
 
 
-@celery_app.task
-def download_breeds():
-    client = CatsAPIClient(
+def get_client():
+    cache = index = None
+    if settings.CATS_API_CACHE:
+        cache = caches[settings.CATS_API_CACHE]
+        if isinstance(cache, RedisCache):
+            # Bound the cache across workers, not per process.
+            index = RedisLRUIndex(get_redis_connection(settings.CATS_API_CACHE))
+    rate_limiter = None
+    if settings.CATS_API_RATE_LIMIT:
+        rate_limiter = get_rate_limiter(
+            rate=settings.CATS_API_RATE_LIMIT,
+            capacity=settings.CATS_API_RATE_LIMIT_BURST,
+            url=settings.CATS_API_RATE_LIMIT_REDIS_URL,
+        )
+    return CatsAPIClient(
         host=settings.CATS_API_HOST,
         api_key=settings.CATS_API_KEY,
+        cache=cache,
+        cache_max_entries=settings.CATS_API_CACHE_MAX_ENTRIES,
+        cache_index=index,
+        rate_limiter=rate_limiter,
     )
 
-    breeds = []
-    page = 0
-    limit = settings.CATS_API_DATA_LIMIT
-    while True:
-        data = client.get_breeds(page=page, limit=limit)
-        breeds.extend(data)
-        if len(data) < limit:
-            break
-        page += 1
-
-    logger.info(f"Fetched total of {len(breeds)} breeds.")
-
-    image_ids = {
-        obj["reference_image_id"]
-        for obj in breeds
-        if obj.get("reference_image_id", None)
-    }
-    # Fetch image raw data on demand
-    fetch_images(client, image_ids)
-
-    for breed in breeds:
-        obj, _ = Breed.objects.get_or_create(external_id=breed["id"])
-
-        obj.name = breed["name"]
-        obj.description = breed["description"]
-        obj.alt_names = breed.get("alt_names", "")
-        obj.origin = breed.get("origin", "")
-        obj.country_code = breed.get("country_code", "")
-        obj.vetstreet_url = breed.get("vetstreet_url", "")
-        obj.wikipedia_url = breed.get("wikipedia_url", "")
-
-        # weight
-        weight_imperial = (breed["weight"]["imperial"]).split(" - ")
-        obj.weight_imperial_min = int(weight_imperial[0])
-        obj.weight_imperial_max = int(weight_imperial[1])
-
-        weight_metric = (breed["weight"]["metric"]).split(" - ")
-        obj.weight_metric_min = int(weight_metric[0])
-        obj.weight_metric_max = int(weight_metric[1])
-
-        # lifespan
-        life_span = (breed["life_span"]).split(" - ")
-        obj.life_span_min = int(life_span[0])
-        obj.life_span_max = int(life_span[1])
-
-        # temperament
-        obj.temperament = breed["temperament"]
-        obj.adaptability = breed["adaptability"]
-        obj.affection_level = breed["affection_level"]
-        obj.child_friendly = breed["child_friendly"]
-        obj.dog_friendly = breed["dog_friendly"]
-        obj.energy_level = breed["energy_level"]
-        obj.grooming = breed["grooming"]
-        obj.health_issues = breed["health_issues"]
-        obj.intelligence = breed["intelligence"]
-        obj.shedding_level = breed["shedding_level"]
-        obj.social_needs = breed["social_needs"]
-        obj.stranger_friendly = breed["stranger_friendly"]
-        obj.vocalisation = breed["vocalisation"]
-
-        # characteristics
-        obj.indoor = bool(breed["indoor"])
-        obj.experimental = bool(breed["experimental"])
-        obj.hairless = bool(breed["hairless"])
-        obj.natural = bool(breed["natural"])
-        obj.rare = bool(breed["rare"])
-        obj.rex = bool(breed["rex"])
-        obj.suppressed_tail = bool(breed["suppressed_tail"])
-        obj.short_legs = bool(breed["short_legs"])
-        obj.hypoallergenic = bool(breed["hypoallergenic"])
-
-        # image
-        image_id = breed.get("reference_image_id")
-        if image_id:
-            obj.reference_image_id = image_id
-        obj.save()
-
-
-def fetch_images(client, image_ids):
-    if not image_ids:
-        return
-
-    existing_images = set(Image.objects.values_list("external_id", flat=True))
-    missing_images = image_ids - existing_images
-    logger.info(f"Missing image IDs: {missing_images}")
-
-    if not missing_images:
-        logger.info("No images to retrieve.")
-        return
-
-    for image_id in missing_images:
-        image = client.get_image(image_id)
-        obj = Image.objects.create(
-            external_id=image["id"],
-            url=image["url"],
-            width=image["width"],
-            height=image["height"],
-        )
-        url = image["url"]
-        logger.info(f"Fetching raw image data: {url}")
-
-        response = requests.get(url)
-        if response.status_code == 200:
-            filename = url.split("/")[-1]
-            logger.info(f"Saving image raw data in file: {filename}")
-            image_data = base64.b64decode(base64.b64encode(response.content).decode())
-            obj.image = ContentFile(image_data, name=filename)
-            obj.save()
+
+@celery_app.task(bind=True)
+def download_breeds(self, stalls=0):
+    client = get_client()
+    checkpoint, _ = SyncCheckpoint.objects.get_or_create(name="breeds")
+    if checkpoint.page or checkpoint.pending_image_ids:
+        logger.info(f"Resuming breeds sync from page {checkpoint.page}.")
+    # Pending images only ever shrink within a page, so any change is progress.
+    progress = (checkpoint.page, checkpoint.pending_image_ids)
+
+    total = 0
+    try:
+        for page, count in sync_breeds(client, checkpoint=checkpoint):
+            total += count
+            logger.info(f"Synced breeds page {page}: {count} breeds, {total} so far.")
+            if self.request.id:
+                self.update_state(state="PROGRESS", meta={"page": page, "total": total})
+    except SoftTimeLimitExceeded:
+        # Everything up to the checkpoint is committed; carry on in a new slice.
+        if (checkpoint.page, checkpoint.pending_image_ids) != progress:
+            logger.warning(
+                f"Breeds sync hit the soft time limit, re-enqueueing from page "
+                f"{checkpoint.page}."
+            )
+            self.apply_async()
+        elif stalls < settings.CATS_SYNC_MAX_STALLS:
+            countdown = settings.CATS_SYNC_STALL_BACKOFF * 2**stalls
+            logger.warning(
+                f"Breeds sync made no progress on page {checkpoint.page}, "
+                f"retrying in {countdown}s."
+            )
+            self.apply_async(kwargs={"stalls": stalls + 1}, countdown=countdown)
         else:
-            logger.info("Failed.")
+            logger.error(
+                f"Breeds sync made no progress on page {checkpoint.page} in "
+                f"{stalls + 1} slices, giving up until the next run."
+            )
+        return total
+
+    checkpoint.delete()
+    logger.info(f"Synced total of {total} breeds.")
+    publish_random_manifest.delay()
+    generate_missing_variants.delay()
+    return total
+
+
+@celery_app.task
+def generate_missing_variants():
+    """
+    Fan out derivative generation for stored images that have no variants or
+    placeholders yet.
+    """
+    image_pks = list(
+        Image.objects.exclude(image="")
+        .filter(Q(variants__isnull=True) | Q(blurhash=""))
+        .values_list("pk", flat=True)
+        .distinct()
+    )
+    if image_pks:
+        # Republish once every derivative is in, so the deck points at them.
+        chord(generate_image_variants.si(pk) for pk in image_pks)(
+            publish_random_manifest.si()
+        )
+    return len(image_pks)
+
+
+@celery_app.task
+def generate_image_variants(image_pk):
+    image = Image.objects.filter(pk=image_pk).first()
+    if image is None:
+        return 0
+    changed = False
+    if not image.blurhash and compute_placeholders(image):
+        image.save(update_fields=["blurhash", "dominant_color"])
+        changed = True
+    variants = generate_variants(image)
+    if changed or variants:
+        # Breed details render the image; retire their cached fragments.
+        Breed.objects.filter(image=image).update(
+            version=F("version") + 1, updated_at=timezone.now()
+        )
+    return len(variants)
+
+
+@celery_app.task
+def publish_random_manifest():
+    return publish_manifest()["version"]
+
+
+@celery_app.task
+def flush_votes():
+    return votes.flush_votes()
@@ -0,0 +1,17 @@
+from django import template
+
+from cats.apps.breeds.variants import image_url
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def variant_url(context, image, width):
+    """
+    URL of the derivative of ``image`` best suited to a ``width`` pixel box
+    and to the formats the requesting browser accepts. Views using it must
+    vary on ``Accept``.
+    """
+    request = context.get("request")
+    accept = request.META.get("HTTP_ACCEPT", "") if request else ""
+    return image_url(image, int(width), accept)
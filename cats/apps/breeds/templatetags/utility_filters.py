@@ -1,12 +1,19 @@
 import random
+import zlib
 
 from django import template
 
+from cats.apps.breeds.search import highlight
+
 register = template.Library()
 
 
 @register.filter(name="color")
-def color_filter(color_type="pastel"):
+def color_filter(color_type="pastel", key=None):
+    """
+    A color of the ``color_type`` palette: random, or always the same one for
+    a given ``key`` so the output stays cacheable.
+    """
     pastel_colors = ["#ffb3ba", "#ffdfba", "#ffffba", "#baffc9", "#bae1ff"]
     solid_colors = ["#C41E3A", "#AC1EE7", "#353e2d", "#FF8D11", "#1E59E7"]
     match color_type:
@@ -17,7 +24,10 @@ def color_filter(color_type="pastel"):
         case _:
             color_group = pastel_colors
 
-    idx = random.randint(0, len(color_group) - 1)
+    if key is None:
+        idx = random.randint(0, len(color_group) - 1)
+    else:
+        idx = zlib.crc32(str(key).encode()) % len(color_group)
     return color_group[idx]
 
 
@@ -35,6 +45,14 @@ def range_filter(value):
     return range(value)
 
 
+register.filter("highlight", highlight)
+
+
+@register.filter(name="lookup")
+def lookup_filter(value, key):
+    return value.get(key)
+
+
 @register.filter(name="minus")
 def minus(value, arg):
     try:
@@ -0,0 +1,96 @@
+import hashlib
+import re
+from io import BytesIO
+
+import pytest
+import requests_mock
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from PIL import Image as PILImage
+
+from cats.apps.breeds.models import Image
+from cats.utils.client import CatAPIMatcher, CatsAPIClient
+from cats.utils.redis_client import get_redis
+
+CAT_API_HOST = "mock://api.thecatapi.com"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Keep cached pages from leaking between tests."""
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def redis_db():
+    """Keep the random deck, seen filters and votes from leaking between tests."""
+    redis = get_redis()
+    redis.flushdb()
+    yield redis
+    redis.flushdb()
+
+
+@pytest.fixture
+def api_client():
+    return CatsAPIClient(host=CAT_API_HOST)
+
+
+@pytest.fixture
+def cat_api():
+    """Serve the Cat API mocks and the image CDN without touching the network."""
+    with requests_mock.Mocker(case_sensitive=True) as mocker:
+        mocker.add_matcher(CatAPIMatcher())
+        mocker.get(re.compile(r"https://cdn2\.thecatapi\.com/"), content=b"meow")
+        yield mocker
+
+
+class PagedClient:
+    """Serve a fixed catalog page by page, optionally failing on one page."""
+
+    def __init__(self, breeds, fail_on=None, error=RuntimeError):
+        self.breeds = breeds
+        self.fail_on = fail_on
+        self.error = error
+        self.pages = []
+
+    def get_breeds(self, page=0, limit=10):
+        if page == self.fail_on:
+            raise self.error("Upstream went away")
+        self.pages.append(page)
+        start = page * limit
+        return self.breeds[start:][:limit]
+
+
+@pytest.fixture
+def paged_client():
+    return PagedClient
+
+
+@pytest.fixture
+def breeds(api_client):
+    return api_client.get_breeds()
+
+
+@pytest.fixture
+def make_breeds():
+    """Build ``count`` distinct upstream payloads from a template payload."""
+
+    def make(template, count):
+        return [dict(template, id=f"b{i:03}", name=f"Breed {i}") for i in range(count)]
+
+    return make
+
+
+@pytest.fixture
+def jpeg_bytes():
+    buffer = BytesIO()
+    PILImage.new("RGB", (800, 600), "orange").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def stored_image(db, jpeg_bytes):
+    image = Image(external_id="ozEvzdVM-", width=800, height=600)
+    image.checksum = hashlib.sha256(jpeg_bytes).hexdigest()
+    image.image.save("ozEvzdVM-.jpg", ContentFile(jpeg_bytes))
+    return image
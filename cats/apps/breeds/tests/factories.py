@@ -0,0 +1,47 @@
+from factory import Faker, Sequence
+from factory.django import DjangoModelFactory
+
+from cats.apps.breeds.models import Breed, Image
+
+
+class ImageFactory(DjangoModelFactory):
+    external_id = Sequence(lambda n: f"image-{n}")
+    width = 800
+    height = 600
+
+    class Meta:
+        model = Image
+        django_get_or_create = ["external_id"]
+
+
+class BreedFactory(DjangoModelFactory):
+    external_id = Sequence(lambda n: f"breed-{n}")
+    name = Faker("first_name")
+    description = Faker("paragraph")
+    origin = Faker("country")
+    temperament = "Active, Energetic, Independent"
+    adaptability = Faker("pyint", min_value=1, max_value=5)
+    affection_level = Faker("pyint", min_value=1, max_value=5)
+    child_friendly = Faker("pyint", min_value=1, max_value=5)
+    dog_friendly = Faker("pyint", min_value=1, max_value=5)
+    energy_level = Faker("pyint", min_value=1, max_value=5)
+    grooming = Faker("pyint", min_value=1, max_value=5)
+    health_issues = Faker("pyint", min_value=1, max_value=5)
+    intelligence = Faker("pyint", min_value=1, max_value=5)
+    shedding_level = Faker("pyint", min_value=1, max_value=5)
+    social_needs = Faker("pyint", min_value=1, max_value=5)
+    stranger_friendly = Faker("pyint", min_value=1, max_value=5)
+    vocalisation = Faker("pyint", min_value=1, max_value=5)
+    indoor = False
+    experimental = False
+    hairless = False
+    natural = False
+    rare = False
+    rex = False
+    suppressed_tail = False
+    short_legs = False
+    hypoallergenic = False
+
+    class Meta:
+        model = Breed
+        django_get_or_create = ["external_id"]
@@ -0,0 +1,105 @@
+import pytest
+from django.urls import reverse
+
+from cats.apps.breeds.tests.factories import BreedFactory, ImageFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_breeds_api_pages_with_cursor(client):
+    breeds = BreedFactory.create_batch(3)
+
+    response = client.get(reverse("api:breed-list"), {"page_size": 2})
+    data = response.json()
+
+    assert response.status_code == 200
+    assert [breed["id"] for breed in data["results"]] == [b.pk for b in breeds[:2]]
+    assert data["previous"] is None
+
+    data = client.get(data["next"]).json()
+
+    assert [breed["id"] for breed in data["results"]] == [breeds[2].pk]
+    assert data["next"] is None
+
+
+def test_breeds_api_sparse_fields(client, django_assert_num_queries):
+    BreedFactory.create_batch(3, image=ImageFactory())
+
+    # Savepoints of ATOMIC_REQUESTS and a single SELECT.
+    with django_assert_num_queries(3) as captured:
+        response = client.get(reverse("api:breed-list"), {"fields": "name,image"})
+
+    assert response.status_code == 200
+    assert set(response.json()["results"][0]) == {"name", "image"}
+    query = captured.captured_queries[1]["sql"]
+    assert "JOIN" in query
+    assert '"breeds_breed"."description"' not in query
+
+
+def test_breeds_api_rejects_unknown_fields(client):
+    response = client.get(reverse("api:breed-list"), {"fields": "name,password"})
+
+    assert response.status_code == 400
+    assert "password" in response.json()["fields"]
+
+
+def test_breeds_api_etag(client):
+    breed = BreedFactory()
+    url = reverse("api:breed-detail", args=[breed.pk])
+
+    response = client.get(url)
+
+    assert response["Content-Type"] == "application/json"
+    assert response.json()["name"] == breed.name
+    assert client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 304
+
+
+def test_images_api_url(client, stored_image):
+    upstream = ImageFactory(url="https://cdn2.thecatapi.com/images/0XYvRd7oD.jpg")
+
+    response = client.get(reverse("api:image-list"), {"fields": "url"})
+
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"url": stored_image.image.url},
+        {"url": upstream.url},
+    ]
+
+
+def test_breeds_api_filters(client):
+    match = BreedFactory(energy_level=5, hairless=True)
+    BreedFactory(energy_level=5, hairless=False)
+
+    response = client.get(
+        reverse("api:breed-list"), {"energy_level_min": 4, "hairless": "on"}
+    )
+
+    assert [breed["id"] for breed in response.json()["results"]] == [match.pk]
+    assert client.get(reverse("api:breed-list"), {"grooming_max": 9}).status_code == 400
+
+
+def test_breeds_api_facets(client):
+    BreedFactory(origin="Egypt", energy_level=5)
+    BreedFactory(origin="Greece", energy_level=2)
+
+    response = client.get(reverse("api:breed-facets"), {"energy_level_min": 4})
+    data = response.json()
+
+    assert data["count"] == 1
+    assert data["facets"]["origin"] == {"Egypt": 1}
+    assert data["facets"]["energy_level"]["2"] == 1
+
+
+def test_breeds_api_search(client):
+    BreedFactory(name="Sphynx", hairless=True, description="Hairless and warm.")
+    BreedFactory(name="Donskoy", hairless=False, description="Hairless too.")
+
+    response = client.get(
+        reverse("api:breed-search"), {"q": "hairless", "hairless": "on"}
+    )
+
+    [result] = response.json()["results"]
+    assert result["name"] == "Sphynx"
+    assert result["rank"] > 0
+    assert "<mark>Hairless</mark>" in result["headline"]
+    assert client.get(reverse("api:breed-search")).status_code == 400
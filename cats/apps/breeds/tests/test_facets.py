@@ -0,0 +1,77 @@
+import pytest
+from django.http import QueryDict
+
+from cats.apps.breeds.caching import invalidate_breeds
+from cats.apps.breeds.facets import FacetIndex, get_facet_index
+from cats.apps.breeds.filters import BreedFilterForm
+from cats.apps.breeds.models import Breed
+from cats.apps.breeds.tests.factories import BreedFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def catalog():
+    return [
+        BreedFactory(origin="Egypt", energy_level=5, grooming=1, hairless=True),
+        BreedFactory(origin="Egypt", energy_level=4, grooming=3),
+        BreedFactory(origin="Greece", energy_level=5, grooming=2, rare=True),
+        BreedFactory(origin="Greece", energy_level=1, grooming=None),
+    ]
+
+
+def cleaned(query):
+    form = BreedFilterForm(QueryDict(query))
+    assert form.is_valid(), form.errors
+    return form.cleaned_data
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "",
+        "origin=Egypt",
+        "origin=Atlantis",
+        "energy_level_min=4&grooming_max=2",
+        "grooming_min=1",
+        "energy_level_min=5&rare=on",
+        "hairless=on&rare=on",
+    ],
+)
+def test_facet_search_matches_database(catalog, query):
+    form = BreedFilterForm(QueryDict(query))
+    assert form.is_valid()
+
+    expected = list(
+        form.filter(Breed.objects.order_by("pk")).values_list("pk", flat=True)
+    )
+
+    assert list(FacetIndex.build().search(form.cleaned_data)) == expected
+
+
+def test_facet_counts_lift_own_condition(catalog):
+    result = FacetIndex.build().counts(cleaned("origin=Egypt&energy_level_min=5"))
+
+    assert result["count"] == 1
+    facets = result["facets"]
+    # Other origins are counted with the energy level condition only...
+    assert facets["origin"] == {"Egypt": 1, "Greece": 1}
+    # ...and other energy levels with the origin condition only.
+    assert facets["energy_level"] == {1: 0, 2: 0, 3: 0, 4: 1, 5: 1}
+    assert facets["grooming"] == {1: 1, 2: 0, 3: 0, 4: 0, 5: 0}
+    assert facets["hairless"] == 1
+    assert facets["rare"] == 0
+
+
+def test_facet_index_of_empty_catalog():
+    assert FacetIndex.build().counts({})["count"] == 0
+
+
+def test_facet_index_rebuilt_when_breeds_change(catalog):
+    index = get_facet_index()
+    assert get_facet_index() is index
+
+    BreedFactory()
+    invalidate_breeds()
+
+    assert len(get_facet_index()) == len(index) + 1
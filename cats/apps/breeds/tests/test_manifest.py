@@ -0,0 +1,140 @@
+import json
+
+import pytest
+from django.urls import reverse
+
+from cats.apps.breeds.manifest import current_manifest, publish_manifest, ring_key
+from cats.apps.breeds.tasks import generate_missing_variants
+from cats.apps.breeds.tests.factories import ImageFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def stored_images(stored_image):
+    images = [stored_image]
+    for i in range(4):
+        image = ImageFactory()
+        image.image.name = f"images/{i}.jpg"
+        image.save()
+        images.append(image)
+    return images
+
+
+def test_publish_manifest(stored_images):
+    ImageFactory()  # Not downloaded yet, so left out.
+
+    meta = publish_manifest()
+
+    assert meta["count"] == 5
+    assert current_manifest() == meta
+    # Versions are derived from the content.
+    assert publish_manifest()["version"] == meta["version"]
+
+
+def test_home_page_cost_is_constant(client, django_assert_num_queries, stored_image):
+    publish_manifest()
+    ImageFactory.create_batch(3)
+
+    # Only the savepoint of ATOMIC_REQUESTS.
+    with django_assert_num_queries(2):
+        response = client.get(reverse("home"), HTTP_ACCEPT="image/webp,*/*")
+
+    version = current_manifest()["version"]
+    deck_url = reverse("random-images", args=[version, "webp"])
+    assert f'data-deck-url="{deck_url}"' in response.content.decode()
+
+
+def test_random_images_windows_wrap_around(client, stored_images):
+    version = publish_manifest()["version"]
+    url = reverse("random-images", args=[version, "jpeg"])
+
+    first = client.get(url, {"cursor": 0, "count": 3})
+    # A new visitor, who has not seen anything yet.
+    client.cookies.clear()
+    second = client.get(url, {"cursor": first.json()["next"], "count": 3})
+
+    assert first.status_code == 200
+    assert first.json()["next"] == 3
+    first_ids = [image["id"] for image in first.json()["images"]]
+    second_ids = [image["id"] for image in second.json()["images"]]
+    # Five images in the ring: the second window wraps to the start.
+    assert len(set(first_ids + second_ids)) == 5
+    assert second_ids[2] == first_ids[0]
+
+
+def test_random_images_entries(client, stored_image):
+    version = publish_manifest()["version"]
+
+    response = client.get(reverse("random-images", args=[version, "jpeg"]))
+
+    assert json.loads(response.content)["images"] == [
+        {
+            "id": stored_image.pk,
+            "url": stored_image.image.url,
+            "blurhash": "",
+            "color": "",
+        }
+    ]
+
+
+def test_random_images_rejects_unknown_decks(client, stored_image):
+    publish_manifest()
+
+    unknown = reverse("random-images", args=["0" * 16, "jpeg"])
+    assert client.get(unknown).status_code == 404
+    version = current_manifest()["version"]
+    bad_cursor = reverse("random-images", args=[version, "jpeg"])
+    assert client.get(bad_cursor, {"cursor": "x"}).status_code == 400
+
+
+def test_expired_current_deck_is_republished(client, redis_db, stored_image):
+    version = publish_manifest()["version"]
+    redis_db.delete(ring_key(version))
+
+    response = client.get(reverse("random-images", args=[version, "jpeg"]))
+
+    assert len(response.json()["images"]) == 1
+
+
+def test_variants_republish_manifest(stored_image):
+    version = publish_manifest()["version"]
+
+    generate_missing_variants()
+
+    assert current_manifest()["version"] != version
+
+
+def test_random_images_skip_seen(client, redis_db, stored_images):
+    version = publish_manifest()["version"]
+    url = reverse("random-images", args=[version, "jpeg"])
+
+    first = client.get(url, {"cursor": 0, "count": 3})
+    # Same cursor again: the seen images are skipped, wrapping around.
+    second = client.get(url, {"cursor": 0, "count": 3})
+
+    assert first["Cache-Control"] == "private, no-store"
+    first_ids = {image["id"] for image in first.json()["images"]}
+    second_ids = {image["id"] for image in second.json()["images"]}
+    assert len(first_ids) == 3
+    assert len(second_ids) == 2
+    assert not first_ids & second_ids
+    assert redis_db.strlen(f"seen:{client.cookies['cats_deck'].value}") <= 2**14 // 8
+
+    # Everything has been seen: the deck starts over.
+    third = client.get(url, {"cursor": 0, "count": 3})
+    assert len(third.json()["images"]) == 3
+
+
+def test_random_images_keep_filter_once_cookie_returns(
+    client, redis_db, stored_images, settings
+):
+    version = publish_manifest()["version"]
+    url = reverse("random-images", args=[version, "jpeg"])
+
+    client.get(url, {"cursor": 0, "count": 1})
+    key = f"seen:{client.cookies['cats_deck'].value}"
+    assert 0 < redis_db.ttl(key) <= settings.CATS_SEEN_FILTER_NEW_TTL
+
+    client.get(url, {"cursor": 0, "count": 1})
+    assert redis_db.ttl(key) > settings.CATS_SEEN_FILTER_NEW_TTL
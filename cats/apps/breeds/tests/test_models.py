@@ -0,0 +1,61 @@
+import pytest
+from django.db.models import F
+
+from cats.apps.breeds.models import Breed, Image, characteristics_mask, image_upload_to
+from cats.apps.breeds.tests.factories import BreedFactory
+
+
+def test_image_upload_to_content_hash():
+    image = Image(checksum="abcdef0123")
+
+    assert image_upload_to(image, "Cat.JPG") == "images/ab/cd/abcdef0123.jpg"
+
+
+def test_image_upload_to_without_checksum():
+    assert image_upload_to(Image(), "cat.jpg") == "images/cat.jpg"
+
+
+@pytest.mark.django_db
+def test_breed_save_packs_characteristics():
+    breed = BreedFactory(rare=True, hairless=True)
+
+    assert breed.characteristics == characteristics_mask(["hairless", "rare"])
+
+    breed.rare = False
+    breed.save()
+
+    assert Breed.objects.get().characteristics == characteristics_mask(["hairless"])
+
+
+@pytest.mark.django_db
+def test_breed_save_bumps_stored_version():
+    breed = BreedFactory()
+    # A sync bumps the row after this instance was loaded.
+    Breed.objects.filter(pk=breed.pk).update(version=F("version") + 1)
+
+    breed.name = "Edited"
+    breed.save()
+
+    assert breed.version == 3
+    assert Breed.objects.get().version == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ({"all_of": ["rare", "rex"]}, {"rare rex"}),
+        ({"any_of": ["rex", "hairless"]}, {"rare rex", "rex", "hairless"}),
+        ({"none_of": ["rare", "hairless"]}, {"rex", "plain"}),
+        ({"all_of": ["rex"], "none_of": ["rare"]}, {"rex"}),
+    ],
+)
+def test_breeds_with_characteristics(query, expected):
+    BreedFactory(name="rare rex", rare=True, rex=True)
+    BreedFactory(name="rex", rex=True)
+    BreedFactory(name="hairless", hairless=True)
+    BreedFactory(name="plain")
+
+    breeds = Breed.objects.with_characteristics(**query)
+
+    assert {breed.name for breed in breeds} == expected
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from django.urls import reverse
+
+from cats.apps.breeds.placeholders import blurhash, compute_placeholders, dominant_color
+from cats.apps.breeds.tasks import generate_image_variants
+from cats.apps.breeds.tests.factories import BreedFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_blurhash_of_flat_image():
+    pixels = np.full((6, 8, 3), [255, 165, 0], dtype=np.uint8)
+
+    # Every AC component of a flat image is zero, encoded as "fQ".
+    assert blurhash(pixels) == "LsTO}c^LfQ^L}.s-fQs-fQfQfQfQ"
+
+
+def test_dominant_color_picks_fullest_bucket():
+    pixels = np.zeros((10, 10, 3), dtype=np.uint8)
+    pixels[:, :3] = [0, 0, 255]
+    pixels[:, 3:] = [250, 10, 10]
+    pixels[0, 3] = [240, 0, 0]
+
+    assert dominant_color(pixels) == "#fa0a0a"
+
+
+def test_compute_placeholders(stored_image):
+    assert compute_placeholders(stored_image)
+
+    assert len(stored_image.blurhash) == 28
+    assert stored_image.dominant_color == "#ffa500"
+
+
+def test_generate_image_variants_stores_placeholders(stored_image):
+    breed = BreedFactory(reference_image_id=stored_image.external_id)
+
+    generate_image_variants(stored_image.pk)
+
+    stored_image.refresh_from_db()
+    assert stored_image.blurhash
+    assert stored_image.dominant_color == "#ffa500"
+    # The breed detail renders them, so its cached fragments are retired.
+    breed.refresh_from_db()
+    assert breed.version == 2
+
+
+def test_breed_detail_renders_placeholder(client, stored_image):
+    compute_placeholders(stored_image)
+    stored_image.save()
+    breed = BreedFactory(reference_image_id=stored_image.external_id)
+
+    response = client.get(reverse("breeds:detail", args=[breed.pk]))
+
+    assert f'data-blurhash="{stored_image.blurhash}"' in response.content.decode()
+    assert "background-color: #ffa500" in response.content.decode()
@@ -0,0 +1,67 @@
+import pytest
+from django.db import connection
+
+from cats.apps.breeds.models import Breed
+from cats.apps.breeds.search import highlight, search_breeds
+from cats.apps.breeds.sync import upsert_breeds
+from cats.apps.breeds.tests.factories import BreedFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_search_ranks_names_first():
+    described = BreedFactory(name="Aegean", description="Descends from the Sphynx.")
+    named = BreedFactory(name="Sphynx", description="Hairless and warm.")
+    BreedFactory(name="Bengal", description="Spotted.")
+
+    assert list(search_breeds("sphynx")) == [named, described]
+
+
+def test_search_stems_and_excludes():
+    playful = BreedFactory(temperament="Playful, Curious")
+    BreedFactory(temperament="Playful, Shedding")
+
+    assert list(search_breeds("play -shedding")) == [playful]
+
+
+def test_search_headline_is_escaped_and_highlighted():
+    BreedFactory(description='A <b>playful</b> cat & a "loyal" one.')
+
+    headline = highlight(search_breeds("playful").get().headline)
+
+    assert "<mark>playful</mark>" in headline
+    assert "<b>" not in headline
+    assert "&amp;" in headline and "&quot;loyal&quot;" in headline
+
+
+def test_search_vector_follows_sync_and_edits(breeds):
+    upsert_breeds(breeds)
+    assert search_breeds("aegean").count() == 1
+
+    breed = Breed.objects.get()
+    breed.name = "Cyclades"
+    breed.save()
+
+    assert search_breeds("cyclades").count() == 1
+
+
+def test_search_uses_gin_index():
+    BreedFactory(name="Sphynx")
+    with connection.cursor() as cursor:
+        # Too few rows for the planner to bother otherwise.
+        cursor.execute("SET LOCAL enable_seqscan = off")
+
+    plan = search_breeds("sphynx").explain()
+
+    assert "breed_search_idx" in plan
+
+
+def test_search_fallback_without_postgres(monkeypatch):
+    match = BreedFactory(name="Bengal", description="Spotted and wild looking.")
+    BreedFactory(name="Sphynx", description="Hairless.")
+    monkeypatch.setattr(connection, "vendor", "sqlite")
+
+    breeds = list(search_breeds("WILD"))
+
+    assert breeds == [match]
+    assert breeds[0].headline == match.description
@@ -0,0 +1,330 @@
+import hashlib
+import os
+from unittest.mock import patch
+
+import pytest
+import requests
+from celery.exceptions import SoftTimeLimitExceeded
+
+from cats.apps.breeds.models import Breed, Image, SyncCheckpoint, characteristics_mask
+from cats.apps.breeds.sync import (
+    CHANGED,
+    NEW,
+    UNCHANGED,
+    _write_changes,
+    diff_breeds,
+    download_to_spool,
+    drop_pending,
+    fetch_images,
+    iter_breed_pages,
+    parse_breed,
+    remove_breeds,
+    sync_breeds,
+    upsert_breeds,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def test_parse_breed(breeds):
+    obj = parse_breed(breeds[0])
+
+    assert obj.pk is None
+    assert obj.external_id == "aege"
+    assert (obj.weight_imperial_min, obj.weight_imperial_max) == (7, 10)
+    assert (obj.life_span_min, obj.life_span_max) == (9, 12)
+    assert obj.indoor is False
+    assert obj.reference_image_id == "ozEvzdVM-"
+
+
+def test_upsert_breeds_packs_characteristics(breeds):
+    breeds[0]["rare"] = 1
+    breeds[0]["hypoallergenic"] = 1
+    upsert_breeds(breeds)
+
+    breeds[0]["rare"] = 0
+    upsert_breeds(breeds)
+
+    assert Breed.objects.get().characteristics == characteristics_mask(
+        ["hypoallergenic"]
+    )
+
+
+def test_upsert_breeds_creates_and_updates(breeds):
+    breeds[0].pop("reference_image_id")
+    assert upsert_breeds(breeds) == (1, 0, 0)
+
+    breeds[0]["name"] = "Aegean Cat"
+    assert upsert_breeds(breeds) == (0, 1, 0)
+    assert upsert_breeds(breeds) == (0, 0, 1)
+
+    breed = Breed.objects.get()
+    assert breed.name == "Aegean Cat"
+    assert breed.image is None
+    # Bumped by the update only.
+    assert breed.version == 2
+
+
+def test_upsert_breeds_links_images(breeds):
+    upsert_breeds(breeds)
+    image = Image.objects.create(external_id="ozEvzdVM-", width=1, height=1)
+
+    # Same content, but the reference image is only available now.
+    assert upsert_breeds(breeds) == (0, 1, 0)
+    assert Breed.objects.get().image == image
+
+
+def test_upsert_breeds_skips_local_edits_only_when_unchanged(breeds):
+    breeds[0].pop("reference_image_id")
+    upsert_breeds(breeds)
+    breed = Breed.objects.get()
+    breed.name = "Edited"
+    breed.save()
+
+    assert upsert_breeds(breeds) == (0, 1, 0)
+    assert Breed.objects.get().name == "Aegean"
+
+
+def test_diff_breeds(breeds, make_breeds):
+    breeds[0].pop("reference_image_id")
+    payload = make_breeds(breeds[0], 3)
+    upsert_breeds(payload[:2])
+    payload[1]["grooming"] = 5
+
+    diff = diff_breeds([parse_breed(breed) for breed in payload])
+
+    assert [obj.external_id for obj in diff[UNCHANGED]] == ["b000"]
+    assert [obj.external_id for obj in diff[CHANGED]] == ["b001"]
+    assert [obj.external_id for obj in diff[NEW]] == ["b002"]
+    assert diff[CHANGED][0].pk == Breed.objects.get(external_id="b001").pk
+
+
+def test_upsert_breeds_query_count(breeds, django_assert_num_queries, make_breeds):
+    Image.objects.create(external_id="ozEvzdVM-", width=1, height=1)
+    payload = make_breeds(breeds[0], 25)
+    upsert_breeds(payload[:10])
+    payload[0]["name"] = "Renamed"
+
+    # Per chunk: savepoint pair, diff read, image lookup, insert, key read,
+    # search vector refresh and, for the first chunk only, an update.
+    with django_assert_num_queries(8 + 7):
+        assert upsert_breeds(payload, chunk_size=20) == (15, 1, 9)
+
+    # A no-op sync only reads.
+    with django_assert_num_queries(2 * 3):
+        assert upsert_breeds(payload, chunk_size=20) == (0, 0, 25)
+
+
+def test_upsert_breeds_after_concurrent_insert(breeds, make_breeds):
+    payload = make_breeds(breeds[0], 2)
+    objs = [parse_breed(breed) for breed in payload]
+    diff = diff_breeds(objs)
+    # Another sync stores the same breeds, one of them differently, between
+    # this diff and its insert.
+    upsert_breeds([payload[0], dict(payload[1], name="Elsewhere")])
+
+    _write_changes(diff[NEW], diff[CHANGED])
+
+    assert sorted(Breed.objects.values_list("external_id", "name", "version")) == [
+        ("b000", "Breed 0", 1),
+        ("b001", "Breed 1", 2),
+    ]
+
+
+def test_remove_breeds(breeds, make_breeds):
+    upsert_breeds(make_breeds(breeds[0], 3))
+
+    assert remove_breeds({"b000", "b002"}) == 1
+    assert set(Breed.objects.values_list("external_id", flat=True)) == {
+        "b000",
+        "b002",
+    }
+    # Nothing seen upstream looks like an outage, not an empty catalog.
+    assert remove_breeds(set()) == 0
+    assert Breed.objects.count() == 2
+
+
+def test_remove_breeds_query_count(
+    breeds, make_breeds, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    upsert_breeds(make_breeds(breeds[0], 10))
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        with django_assert_num_queries(1):
+            assert remove_breeds({"b000"}) == 9
+
+    assert len(callbacks) == 1
+    assert Breed.objects.count() == 1
+
+
+def test_iter_breed_pages(breeds, paged_client, make_breeds):
+    client = paged_client(make_breeds(breeds[0], 5))
+
+    pages = [(page, len(data)) for page, data in iter_breed_pages(client, limit=2)]
+
+    assert pages == [(0, 2), (1, 2), (2, 1)]
+
+
+def test_iter_breed_pages_start_page(breeds, paged_client, make_breeds):
+    client = paged_client(make_breeds(breeds[0], 4))
+
+    pages = [page for page, _ in iter_breed_pages(client, start_page=1, limit=2)]
+
+    # A full last page needs one extra (empty) request to detect the end.
+    assert pages == [1, 2]
+
+
+def test_sync_breeds_commits_each_page(breeds, paged_client, settings, make_breeds):
+    settings.CATS_API_DATA_LIMIT = 2
+    for breed in breeds:
+        breed.pop("reference_image_id")
+    client = paged_client(make_breeds(breeds[0], 6), fail_on=2)
+
+    synced = []
+    with pytest.raises(RuntimeError):
+        for page, count in sync_breeds(client):
+            synced.append(page)
+
+    assert synced == [0, 1]
+    assert Breed.objects.count() == 4
+
+
+def test_sync_breeds_removes_unlisted_breeds(breeds, paged_client, make_breeds):
+    for breed in breeds:
+        breed.pop("reference_image_id")
+    upsert_breeds(make_breeds(breeds[0], 3))
+
+    list(sync_breeds(paged_client(make_breeds(breeds[0], 2))))
+
+    assert Breed.objects.count() == 2
+
+
+def test_fetch_images(api_client, cat_api):
+    Image.objects.create(external_id="existing", width=1, height=1)
+
+    fetch_images(api_client, {"existing", "a", "b", "c"}, concurrency=2)
+
+    assert Image.objects.count() == 4
+    image = Image.objects.get(external_id="b")
+    assert image.width == 1600
+    assert image.image.read() == b"meow"
+    assert image.size == 4
+    assert image.checksum == hashlib.sha256(b"meow").hexdigest()
+    assert not any("existing" in r.url for r in cat_api.request_history)
+
+
+def test_fetch_images_deduplicates_content(api_client, cat_api):
+    fetch_images(api_client, {"a", "b"}, concurrency=1)
+
+    a, b = Image.objects.order_by("external_id")
+    checksum = hashlib.sha256(b"meow").hexdigest()
+    assert a.image.name == b.image.name
+    assert a.image.name == f"images/{checksum[:2]}/{checksum[2:4]}/{checksum}.jpg"
+    assert os.listdir(os.path.dirname(a.image.path)) == [f"{checksum}.jpg"]
+
+
+def test_fetch_images_failed_download(api_client, cat_api):
+    url = "https://cdn2.thecatapi.com/images/j5cVSqLer.jpg"
+    cat_api.get(url, status_code=404)
+
+    fetch_images(api_client, {"a"})
+
+    assert not Image.objects.exists()
+
+    # The next sync retries it.
+    cat_api.get(url, content=b"meow")
+    fetch_images(api_client, {"a"})
+
+    assert Image.objects.get(external_id="a").image
+
+
+def test_fetch_images_skips_failed_images(api_client, cat_api):
+    cat_api.get("mock://api.thecatapi.com/v1/images/gone", status_code=404)
+
+    fetch_images(api_client, {"a", "gone", "b"}, concurrency=2)
+
+    assert sorted(Image.objects.values_list("external_id", flat=True)) == ["a", "b"]
+
+
+def test_fetch_images_keeps_finished_batches_when_interrupted(api_client, cat_api):
+    batches = []
+
+    def on_stored(image_ids):
+        batches.append(image_ids)
+        if len(batches) == 2:
+            raise SoftTimeLimitExceeded()
+
+    with pytest.raises(SoftTimeLimitExceeded):
+        fetch_images(
+            api_client,
+            {"a", "b", "c"},
+            concurrency=1,
+            batch_size=1,
+            on_stored=on_stored,
+        )
+
+    assert Image.objects.count() == 2
+    assert set().union(*batches) == set(
+        Image.objects.values_list("external_id", flat=True)
+    )
+
+
+def test_fetch_images_shrinks_pending_images(api_client, cat_api):
+    Image.objects.create(external_id="a", width=1, height=1)
+    checkpoint = SyncCheckpoint.objects.create(
+        name="breeds", pending_image_ids=["a", "b", "c"]
+    )
+    drop = drop_pending(checkpoint, {"a", "b", "c"})
+    pending = []
+
+    def on_stored(image_ids):
+        drop(image_ids)
+        checkpoint.refresh_from_db()
+        pending.append(len(checkpoint.pending_image_ids))
+
+    fetch_images(api_client, {"a", "b", "c"}, batch_size=1, on_stored=on_stored)
+
+    assert pending == [2, 1, 0]
+
+
+def test_sync_breeds_resumes_from_checkpoint(
+    breeds, paged_client, settings, make_breeds
+):
+    settings.CATS_API_DATA_LIMIT = 2
+    checkpoint = SyncCheckpoint.objects.create(name="breeds")
+    client = paged_client(make_breeds(breeds[0], 5))
+
+    with patch(
+        "cats.apps.breeds.sync.fetch_images",
+        side_effect=[None, RuntimeError("CDN went away")],
+    ), pytest.raises(RuntimeError):
+        list(sync_breeds(client, checkpoint=checkpoint))
+
+    checkpoint.refresh_from_db()
+    assert checkpoint.page == 1
+    assert checkpoint.pending_image_ids == ["ozEvzdVM-"]
+
+    with patch("cats.apps.breeds.sync.fetch_images") as fetch:
+        pages = [page for page, _ in sync_breeds(client, checkpoint=checkpoint)]
+
+    assert pages == [1, 2]
+    assert fetch.call_args_list[0].args[1] == {"ozEvzdVM-"}
+    assert client.pages == [0, 1, 1, 2]
+    assert Breed.objects.count() == 5
+    checkpoint.refresh_from_db()
+    assert (checkpoint.page, checkpoint.pending_image_ids) == (3, [])
+    assert len(checkpoint.seen_ids) == 5
+
+
+def test_download_to_spool_spills_large_bodies(cat_api, settings):
+    settings.CATS_IMAGE_SPOOL_SIZE = 4
+    body = b"purr" * 10_000
+    cat_api.get("https://cdn2.thecatapi.com/images/big.jpg", content=body)
+
+    response = requests.get("https://cdn2.thecatapi.com/images/big.jpg", stream=True)
+    with download_to_spool(response) as (spool, size, checksum):
+        assert spool._rolled
+        assert spool.read() == body
+
+    assert size == len(body)
+    assert checksum == hashlib.sha256(body).hexdigest()
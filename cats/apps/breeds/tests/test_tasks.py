@@ -0,0 +1,61 @@
+from unittest.mock import call, patch
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+
+from cats.apps.breeds import tasks
+from cats.apps.breeds.models import Breed, SyncCheckpoint
+from cats.apps.breeds.tasks import download_breeds
+
+pytestmark = pytest.mark.django_db
+
+
+def test_download_breeds(cat_api):
+    assert download_breeds() == 1
+
+    breed = Breed.objects.get()
+    assert breed.external_id == "aege"
+    assert breed.image.external_id == "ozEvzdVM-"
+
+
+def test_download_breeds_reenqueues_on_soft_time_limit(
+    breeds, paged_client, make_breeds, settings, monkeypatch
+):
+    settings.CATS_API_DATA_LIMIT = 1
+    for breed in breeds:
+        breed.pop("reference_image_id")
+    client = paged_client(
+        make_breeds(breeds[0], 3), fail_on=2, error=SoftTimeLimitExceeded
+    )
+    monkeypatch.setattr(tasks, "CatsAPIClient", lambda **kwargs: client)
+
+    with patch.object(download_breeds, "apply_async") as apply_async:
+        assert download_breeds() == 2
+
+    apply_async.assert_called_once_with()
+    assert SyncCheckpoint.objects.get(name="breeds").page == 2
+
+    client.fail_on = None
+    assert download_breeds() == 1
+    assert client.pages == [0, 1, 2, 3]
+    assert Breed.objects.count() == 3
+    assert not SyncCheckpoint.objects.exists()
+
+
+def test_download_breeds_backs_off_when_stalled(
+    breeds, paged_client, settings, monkeypatch
+):
+    settings.CATS_SYNC_MAX_STALLS = 2
+    settings.CATS_SYNC_STALL_BACKOFF = 60
+    client = paged_client(breeds, fail_on=0, error=SoftTimeLimitExceeded)
+    monkeypatch.setattr(tasks, "CatsAPIClient", lambda **kwargs: client)
+
+    with patch.object(download_breeds, "apply_async") as apply_async:
+        download_breeds()
+        download_breeds(stalls=1)
+        download_breeds(stalls=2)
+
+    assert apply_async.call_args_list == [
+        call(kwargs={"stalls": 1}, countdown=60),
+        call(kwargs={"stalls": 2}, countdown=120),
+    ]
@@ -0,0 +1,87 @@
+import pytest
+from django.core.files.base import ContentFile
+from PIL import Image as PILImage
+
+from cats.apps.breeds.models import ImageVariant
+from cats.apps.breeds.tasks import generate_missing_variants
+from cats.apps.breeds.variants import (
+    accepted_formats,
+    generate_variants,
+    image_url,
+    pick_variant,
+    variant_widths,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def test_variant_widths():
+    assert variant_widths(800) == [192, 384, 768]
+    assert variant_widths(100) == [100]
+
+
+def test_generate_variants(stored_image):
+    variants = generate_variants(stored_image)
+
+    assert sorted((v.width, v.format) for v in variants) == [
+        (192, "jpeg"),
+        (192, "webp"),
+        (384, "jpeg"),
+        (384, "webp"),
+        (768, "jpeg"),
+        (768, "webp"),
+    ]
+    variant = stored_image.variants.get(width=384, format="webp")
+    assert variant.height == 288
+    assert variant.file.name.startswith(f"variants/{stored_image.checksum[:2]}/")
+    with variant.file.open("rb") as f:
+        assert PILImage.open(f).format == "WEBP"
+
+    # Already generated variants are skipped.
+    assert generate_variants(stored_image) == []
+
+
+def test_generate_variants_undecodable(stored_image):
+    stored_image.image.save("broken.jpg", ContentFile(b"meow"))
+
+    assert generate_variants(stored_image) == []
+
+
+def test_generate_missing_variants_task(stored_image):
+    assert generate_missing_variants() == 1
+    assert ImageVariant.objects.count() == 6
+    assert generate_missing_variants() == 0
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        ("", ["jpeg"]),
+        ("image/webp,*/*", ["webp", "jpeg"]),
+        ("image/avif,image/webp,*/*", ["avif", "webp", "jpeg"]),
+    ],
+)
+def test_accepted_formats(accept, expected):
+    assert accepted_formats(accept) == expected
+
+
+def test_pick_variant():
+    variants = [
+        ImageVariant(width=width, format=fmt)
+        for width in (192, 384, 768)
+        for fmt in ("webp", "jpeg")
+    ]
+
+    picked = pick_variant(variants, 300, "image/webp")
+    assert (picked.width, picked.format) == (384, "webp")
+    picked = pick_variant(variants, 2000, "")
+    assert (picked.width, picked.format) == (768, "jpeg")
+    assert pick_variant([], 300) is None
+
+
+def test_image_url_falls_back_to_original(stored_image):
+    assert image_url(stored_image, 384) == stored_image.image.url
+
+    generate_variants(stored_image)
+    assert image_url(stored_image, 384, "image/webp").endswith("-384.webp")
+    assert image_url(None, 384) == ""
@@ -0,0 +1,252 @@
+from io import BytesIO
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from PIL import Image as PILImage
+
+from cats.apps.breeds.sync import upsert_breeds
+from cats.apps.breeds.templatetags.utility_filters import color_filter
+from cats.apps.breeds.tests.factories import BreedFactory
+from cats.apps.breeds.variants import generate_variants
+
+pytestmark = pytest.mark.django_db
+
+
+def test_breed_detail_serves_accepted_variant(client, stored_image):
+    generate_variants(stored_image)
+    breed = BreedFactory(reference_image_id=stored_image.external_id)
+
+    response = client.get(
+        reverse("breeds:detail", args=[breed.pk]), HTTP_ACCEPT="image/webp,*/*"
+    )
+
+    assert response.status_code == 200
+    assert "Accept" in response["Vary"]
+    assert f'src="{stored_image.variants.get(width=384, format="webp").file.url}"' in (
+        response.content.decode()
+    )
+
+
+def test_image_resize(client, settings, tmp_path, stored_image):
+    settings.CATS_RESIZE_CACHE_DIR = str(tmp_path)
+    url = reverse("image-resize", args=[stored_image.pk, 200, 200, "jpeg"])
+
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/jpeg"
+    assert response["X-Cache"] == "MISS"
+    assert "immutable" in response["Cache-Control"]
+    resized = PILImage.open(BytesIO(b"".join(response.streaming_content)))
+    assert resized.size == (200, 150)
+
+    assert client.get(url)["X-Cache"] == "HIT"
+
+
+@pytest.mark.parametrize("size, fmt", [((200, 200), "gif"), ((0, 200), "jpeg")])
+def test_image_resize_rejects_bad_requests(client, stored_image, size, fmt):
+    url = reverse("image-resize", args=[stored_image.pk, *size, fmt])
+
+    assert client.get(url).status_code == 404
+
+
+def test_breeds_list_pages(client, settings, django_assert_num_queries):
+    settings.CATS_BREEDS_PAGE_SIZE = 2
+    breeds = BreedFactory.create_batch(3)
+
+    response = client.get(reverse("breeds:list"))
+
+    content = response.content.decode()
+    assert breeds[0].name in content and breeds[1].name in content
+    assert f'{reverse("breeds:list")}?after={breeds[1].pk}' in content
+    assert "HX-Request" in response["Vary"]
+
+    response = client.get(
+        reverse("breeds:list"), {"after": breeds[1].pk}, HTTP_HX_REQUEST="true"
+    )
+
+    content = response.content.decode()
+    assert breeds[2].name in content
+    assert "<html" not in content
+    assert "?after=" not in content
+
+
+def test_breeds_list_filters(client, settings):
+    settings.CATS_BREEDS_PAGE_SIZE = 1
+    first, second = BreedFactory.create_batch(2, name="Match", energy_level=5)
+    BreedFactory(name="Sleepy", energy_level=1)
+    client.get(reverse("breeds:list"))
+
+    response = client.get(reverse("breeds:list"), {"energy_level_min": 4})
+
+    content = response.content.decode()
+    assert "Match" in content and "Sleepy" not in content
+    assert f"?energy_level_min=4&after={first.pk}" in content
+
+    response = client.get(
+        reverse("breeds:list"),
+        {"energy_level_min": 4, "after": first.pk},
+        HTTP_HX_REQUEST="true",
+    )
+
+    content = response.content.decode()
+    assert f'id="breed-{second.pk}"' in content
+    # Counts were sent along with the first page only.
+    assert "breed-facets" not in content
+
+
+def test_breeds_list_updates_facet_counts(client):
+    BreedFactory(origin="Egypt", energy_level=5)
+    BreedFactory(origin="Greece", energy_level=1)
+
+    response = client.get(
+        reverse("breeds:list"), {"energy_level_min": 4}, HTTP_HX_REQUEST="true"
+    )
+
+    content = response.content.decode()
+    assert 'id="breed-facets"' in content and 'hx-swap-oob="true"' in content
+    assert ">1 breed<" in content
+    assert "Egypt (1)" in content and "Greece" not in content
+
+
+def test_breeds_list_rejects_invalid_filters(client):
+    response = client.get(reverse("breeds:list"), {"grooming_max": 9})
+
+    assert response.status_code == 400
+
+
+def test_breeds_search(client):
+    BreedFactory(name="Sphynx", description="Hairless and warm.")
+    BreedFactory(name="Bengal", description="Spotted.")
+
+    response = client.get(
+        reverse("breeds:search"), {"q": "hairless"}, HTTP_HX_REQUEST="true"
+    )
+
+    content = response.content.decode()
+    assert "Sphynx" in content and "Bengal" not in content
+    assert "<mark>Hairless</mark>" in content
+
+
+def test_breeds_search_without_query_lists_breeds(client):
+    BreedFactory(name="Sphynx")
+
+    response = client.get(reverse("breeds:search"), {"q": " "}, HTTP_HX_REQUEST="true")
+
+    assert "Sphynx" in response.content.decode()
+    assert 'id="breed-facets"' in response.content.decode()
+
+
+def test_breeds_list_prunes_columns(client, django_assert_num_queries):
+    BreedFactory()
+
+    # Savepoints, the page and the facet index build.
+    with django_assert_num_queries(4) as queries:
+        client.get(reverse("breeds:list"))
+
+    select = next(q["sql"] for q in queries.captured_queries if "SELECT" in q["sql"])
+    assert '"name"' in select
+    assert '"description"' not in select
+
+
+def test_breeds_list_colors_are_deterministic(client):
+    breed = BreedFactory()
+    first = client.get(reverse("breeds:list")).content
+    cache.clear()
+
+    assert client.get(reverse("breeds:list")).content == first
+    assert f"color:{color_filter('pastel', breed.external_id)}" in first.decode()
+
+
+def test_breeds_list_is_cached_until_breeds_change(
+    client, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    breed = BreedFactory(name="Abyssinian")
+    client.get(reverse("breeds:list"))
+
+    # Only the savepoint of ATOMIC_REQUESTS.
+    with django_assert_num_queries(2):
+        assert "Abyssinian" in client.get(reverse("breeds:list")).content.decode()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        breed.name = "Aegean"
+        breed.save()
+
+    assert "Aegean" in client.get(reverse("breeds:list")).content.decode()
+
+
+def test_sync_invalidates_breeds_list(
+    client, breeds, django_capture_on_commit_callbacks
+):
+    client.get(reverse("breeds:list"))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        upsert_breeds(breeds)
+
+    assert breeds[0]["name"] in client.get(reverse("breeds:list")).content.decode()
+
+
+def test_breed_detail_conditional_get(client, django_assert_num_queries):
+    breed = BreedFactory()
+    url = reverse("breeds:detail", args=[breed.pk])
+
+    response = client.get(url)
+    etag = response["ETag"]
+    assert response.status_code == 200
+    assert "Last-Modified" in response
+
+    # A savepoint around the version lookup, and nothing else.
+    with django_assert_num_queries(3):
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    with django_assert_num_queries(3):
+        cached = client.get(url)
+    assert cached.content == response.content
+    assert cached["ETag"] == etag
+
+    breed.temperament = "Lazy"
+    breed.save()
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert "Lazy" in response.content.decode()
+
+
+def test_breed_detail_etag_varies_on_format(client):
+    breed = BreedFactory()
+    url = reverse("breeds:detail", args=[breed.pk])
+
+    jpeg = client.get(url)["ETag"]
+    webp = client.get(url, HTTP_ACCEPT="image/webp,*/*")["ETag"]
+
+    assert jpeg != webp
+
+
+def test_breed_detail_not_found(client):
+    assert client.get(reverse("breeds:detail", args=[0])).status_code == 404
+
+
+def test_breed_details_batch(client, django_assert_num_queries):
+    breeds = BreedFactory.create_batch(3)
+    ids = ",".join(str(breed.pk) for breed in breeds[:2])
+    # One cached already, by a click on its detail.
+    client.get(reverse("breeds:detail", args=[breeds[0].pk]))
+
+    # Inside a savepoint: the versions, then only the missing breed with its
+    # image (it has none, so there are no variants to prefetch).
+    with django_assert_num_queries(4):
+        response = client.get(reverse("breeds:details"), {"ids": f"{ids},0"})
+
+    details = response.json()
+    assert set(details) == {str(breeds[0].pk), str(breeds[1].pk)}
+    assert breeds[1].name in details[str(breeds[1].pk)]
+
+    # Both are cached now.
+    with django_assert_num_queries(3):
+        assert client.get(reverse("breeds:details"), {"ids": ids}).json() == details
+
+
+@pytest.mark.parametrize("ids", ["1,x", ",".join(str(i) for i in range(100))])
+def test_breed_details_batch_rejects_bad_requests(client, ids):
+    assert client.get(reverse("breeds:details"), {"ids": ids}).status_code == 400
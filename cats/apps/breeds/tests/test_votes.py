@@ -0,0 +1,154 @@
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from redis import RedisError
+
+from cats.apps.breeds.manifest import publish_manifest
+from cats.apps.breeds.tasks import flush_votes
+from cats.apps.breeds.tests.factories import BreedFactory
+from cats.apps.breeds.votes import (
+    FLUSH_LOCK_KEY,
+    MOST_LIKED_KEY,
+    most_liked,
+    record_vote,
+)
+from cats.utils.redis_client import get_redis
+
+pytestmark = pytest.mark.django_db
+
+
+def test_vote_is_buffered_without_db_writes(
+    client, django_assert_num_queries, stored_image
+):
+    publish_manifest()
+
+    # Only the savepoint of ATOMIC_REQUESTS.
+    with django_assert_num_queries(2):
+        response = client.post(
+            reverse("random-vote"), {"image": stored_image.pk, "action": "like"}
+        )
+
+    assert response.status_code == 204
+    stored_image.refresh_from_db()
+    assert stored_image.likes == 0
+    assert most_liked() == [(stored_image.pk, 1)]
+
+
+@pytest.mark.parametrize(
+    "data, status",
+    [
+        ({"image": "x", "action": "like"}, 400),
+        ({"image": 1, "action": "meh"}, 400),
+        ({"image": 0, "action": "like"}, 404),
+    ],
+)
+def test_vote_rejects_bad_requests(client, stored_image, data, status):
+    publish_manifest()
+
+    assert client.post(reverse("random-vote"), data).status_code == status
+
+
+@pytest.fixture
+def redis_down():
+    with patch("cats.apps.breeds.manifest.get_redis", side_effect=RedisError), patch(
+        "cats.apps.breeds.votes.get_redis", side_effect=RedisError
+    ):
+        yield
+
+
+def test_vote_unavailable_without_redis(client, stored_image, redis_down):
+    response = client.post(
+        reverse("random-vote"), {"image": stored_image.pk, "action": "like"}
+    )
+
+    assert response.status_code == 503
+
+
+def test_flush_votes(django_assert_num_queries, stored_image):
+    breed = BreedFactory(reference_image_id=stored_image.external_id)
+    for action in ["like", "like", "hate"]:
+        record_vote(stored_image.pk, action)
+
+    # Inside a savepoint: the batch check and record, one UPDATE per table
+    # and the pruning of old batch ids.
+    with django_assert_num_queries(7):
+        assert flush_votes() == 3
+
+    stored_image.refresh_from_db()
+    breed.refresh_from_db()
+    assert (stored_image.likes, stored_image.hates) == (2, 1)
+    assert (breed.likes, breed.hates) == (2, 1)
+    # The buffer was drained.
+    assert flush_votes() == 0
+
+
+def test_flush_votes_runs_one_at_a_time(stored_image):
+    record_vote(stored_image.pk, "like")
+    lock = get_redis().lock(FLUSH_LOCK_KEY)
+    lock.acquire()
+
+    # Another flush holds the lock.
+    assert flush_votes() == 0
+
+    lock.release()
+    assert flush_votes() == 1
+    assert flush_votes() == 0
+    stored_image.refresh_from_db()
+    assert stored_image.likes == 1
+
+
+def test_flush_votes_replay_is_not_counted_twice(stored_image):
+    record_vote(stored_image.pk, "like")
+    redis = get_redis()
+    delete = redis.delete
+
+    def fail_on_flushing(*keys):
+        if b"votes:flushing" in [key.encode() for key in keys]:
+            raise RedisError("Connection lost.")
+        return delete(*keys)
+
+    # The counters are committed, but the batch stays in Redis.
+    with patch.object(redis, "delete", side_effect=fail_on_flushing):
+        with pytest.raises(RedisError):
+            flush_votes()
+
+    record_vote(stored_image.pk, "like")
+    # The replayed batch is dropped; the new vote waits for the next flush.
+    assert flush_votes() == 0
+    assert flush_votes() == 1
+    stored_image.refresh_from_db()
+    assert stored_image.likes == 2
+
+
+def test_flush_votes_rebuilds_lost_ranking(redis_db, stored_image):
+    record_vote(stored_image.pk, "like")
+    redis_db.delete(MOST_LIKED_KEY)
+
+    flush_votes()
+
+    assert most_liked() == [(stored_image.pk, 1)]
+
+
+def test_most_liked(client, stored_image):
+    publish_manifest()
+    record_vote(stored_image.pk, "like")
+
+    response = client.get(reverse("most-liked"))
+
+    assert response.json()["images"] == [
+        {
+            "id": stored_image.pk,
+            "url": stored_image.image.url,
+            "blurhash": "",
+            "color": "",
+            "likes": 1,
+        }
+    ]
+
+
+def test_most_liked_empty_without_redis(client, redis_down):
+    response = client.get(reverse("most-liked"))
+
+    assert response.status_code == 200
+    assert response.json() == {"images": []}
@@ -1,9 +1,16 @@
 from django.urls import path
 
-from cats.apps.breeds.views import BreedDetailView, BreedsListView
+from cats.apps.breeds.views import (
+    BreedDetailsBatchView,
+    BreedDetailView,
+    BreedSearchView,
+    BreedsListView,
+)
 
 app_name = "breeds"
 urlpatterns = [
     path("", BreedsListView.as_view(), name="list"),
     path("<int:pk>", BreedDetailView.as_view(), name="detail"),
+    path("details", BreedDetailsBatchView.as_view(), name="details"),
+    path("search", BreedSearchView.as_view(), name="search"),
 ]
@@ -0,0 +1,163 @@
+import logging
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image as PILImage
+from PIL import ImageOps, UnidentifiedImageError
+
+from cats.apps.breeds.models import ImageVariant
+
+logger = logging.getLogger(__name__)
+
+# Widths of the generated derivatives; the largest covers the random-cats
+# cards at 2x, the smallest the breed detail avatar.
+VARIANT_WIDTHS = (192, 384, 768, 1200)
+
+# Formats in order of preference, with the Pillow writer options for each.
+VARIANT_FORMATS = {
+    "avif": {"pil_format": "AVIF", "options": {"quality": 60}},
+    "webp": {"pil_format": "WEBP", "options": {"quality": 80, "method": 4}},
+    "jpeg": {
+        "pil_format": "JPEG",
+        "options": {"quality": 82, "optimize": True, "progressive": True},
+    },
+}
+
+FORMAT_MIME_TYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+}
+
+
+def supported_formats():
+    """Derivative formats the installed Pillow can write (JPEG always)."""
+    # Pillow registers its writers lazily, on the first image opened or saved.
+    PILImage.init()
+    return [
+        fmt
+        for fmt, spec in VARIANT_FORMATS.items()
+        if spec["pil_format"] in PILImage.SAVE
+    ]
+
+
+def variant_widths(original_width):
+    """Widths to generate for an image, never upscaling the original."""
+    widths = [width for width in VARIANT_WIDTHS if width < original_width]
+    return widths or [original_width]
+
+
+def generate_variants(image):
+    """
+    Render every missing size/format derivative of ``image`` and store them.
+
+    Returns the list of created ``ImageVariant`` rows.
+    """
+    if not image.image:
+        return []
+
+    existing = set(image.variants.values_list("width", "format"))
+    try:
+        with image.image.open("rb") as f:
+            source = PILImage.open(f)
+            source = ImageOps.exif_transpose(source)
+            source.load()
+    except (OSError, UnidentifiedImageError):
+        logger.warning(f"Image {image.external_id} could not be decoded.")
+        return []
+
+    stem = image.checksum or image.external_id
+    variants = []
+    for width in variant_widths(source.width):
+        resized = source.copy()
+        resized.thumbnail((width, source.height), PILImage.Resampling.LANCZOS)
+        for fmt in supported_formats():
+            if (width, fmt) in existing:
+                continue
+            content = encode(resized, fmt)
+            variant = ImageVariant(
+                image=image,
+                width=resized.width,
+                height=resized.height,
+                format=fmt,
+                size=len(content),
+            )
+            variant.file.save(f"{stem}-{width}.{fmt}", ContentFile(content), save=False)
+            variants.append(variant)
+
+    ImageVariant.objects.bulk_create(variants, ignore_conflicts=True)
+    logger.info(f"Generated {len(variants)} variants for image {image.external_id}.")
+    return variants
+
+
+def render_resized(image, width, height, fmt):
+    """
+    Encode ``image`` scaled down to fit in ``width`` x ``height``, keeping its
+    aspect ratio.
+    """
+    with image.image.open("rb") as f:
+        source = PILImage.open(f)
+        source = ImageOps.exif_transpose(source)
+        source.thumbnail((width, height), PILImage.Resampling.LANCZOS)
+    return encode(source, fmt)
+
+
+def encode(image, fmt):
+    spec = VARIANT_FORMATS[fmt]
+    if fmt == "jpeg" and image.mode != "RGB":
+        image = image.convert("RGB")
+    elif image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    buffer = BytesIO()
+    image.save(buffer, format=spec["pil_format"], **spec["options"])
+    return buffer.getvalue()
+
+
+def accepted_formats(accept):
+    """Derivative formats a client takes according to its ``Accept`` header."""
+    accept = accept or ""
+    formats = [
+        fmt
+        for fmt, mime_type in FORMAT_MIME_TYPES.items()
+        if fmt != "jpeg" and mime_type in accept
+    ]
+    # Every browser renders JPEG, whatever it advertises.
+    return formats + ["jpeg"]
+
+
+def preferred_format(accept):
+    """Most efficient derivative format both the client and Pillow handle."""
+    supported = supported_formats()
+    return next(fmt for fmt in accepted_formats(accept) if fmt in supported)
+
+
+def pick_variant(variants, width, accept=""):
+    """
+    Choose the variant to serve for a box ``width`` pixels wide.
+
+    Prefers the most efficient format the client accepts, then the smallest
+    variant at least ``width`` wide (or the largest one if none is). Returns
+    ``None`` when there is no usable variant.
+    """
+    for fmt in accepted_formats(accept):
+        candidates = sorted(
+            (variant for variant in variants if variant.format == fmt),
+            key=lambda variant: variant.width,
+        )
+        if not candidates:
+            continue
+        for variant in candidates:
+            if variant.width >= width:
+                return variant
+        return candidates[-1]
+    return None
+
+
+def image_url(image, width, accept=""):
+    """URL of the best derivative of ``image``, or of the original."""
+    if image is None or not image.image:
+        return ""
+    variant = pick_variant(image.variants.all(), width, accept)
+    if variant is None:
+        return image.image.url
+    return variant.file.url
@@ -1,31 +1,396 @@
-from django.shortcuts import render
+import json
+import logging
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+)
+from django.shortcuts import get_object_or_404, render
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date, quote_etag
 from django.views import View
+from django.views.decorators.vary import vary_on_headers
 from django.views.generic import DetailView, ListView
+from PIL import UnidentifiedImageError
+from redis import RedisError
 
+from cats.apps.breeds.caching import breeds_version
+from cats.apps.breeds.facets import get_facet_index
+from cats.apps.breeds.filters import BreedFilterForm
+from cats.apps.breeds.manifest import current_manifest, deck_entries, in_deck, sample
 from cats.apps.breeds.models import Breed, Image
+from cats.apps.breeds.search import search_breeds
+from cats.apps.breeds.variants import (
+    FORMAT_MIME_TYPES,
+    preferred_format,
+    render_resized,
+    supported_formats,
+)
+from cats.apps.breeds.votes import VOTE_ACTIONS, most_liked, record_vote
+from cats.utils.bloom import RedisBloomFilter
+from cats.utils.disk_cache import get_disk_cache
+from cats.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
 
 
+@method_decorator(vary_on_headers("HX-Request"), name="dispatch")
 class BreedsListView(ListView):
+    """
+    Breed names a page at a time, keyed on the last pk of the previous page
+    and loaded by htmx as the list scrolls, optionally narrowed down by a
+    ``BreedFilterForm``. Whole responses are cached until the breeds change.
+    """
+
     model = Breed
     template_name = "breeds/list.html"
+    fragment_template_name = "breeds/partials/list_page.html"
     context_object_name = "breeds"
-    ordering = "pk"
+
+    def get(self, request, *args, **kwargs):
+        try:
+            self.after = int(request.GET.get("after", 0))
+        except ValueError:
+            return HttpResponseBadRequest("after must be an integer.")
+        self.is_fragment = request.headers.get("HX-Request") == "true"
+        self.filter_form = BreedFilterForm(request.GET)
+        if not self.filter_form.is_valid():
+            return HttpResponseBadRequest(self.filter_form.errors.as_text())
+        filters = self.filter_form.query_string()
+
+        key = (
+            f"breeds:list:{breeds_version()}:{self.after}:{self.is_fragment}:{filters}"
+        )
+        content = cache.get(key)
+        if content is None:
+            response = super().get(request, *args, **kwargs)
+            response.render()
+            cache.set(key, response.content, settings.CATS_BREEDS_CACHE_TIMEOUT)
+            return response
+        return HttpResponse(content)
+
+    def get_queryset(self):
+        # One extra row tells whether there is a next page.
+        return (
+            self.filter_form.filter(Breed.objects.only("id", "external_id", "name"))
+            .filter(pk__gt=self.after)
+            .order_by("pk")[: settings.CATS_BREEDS_PAGE_SIZE + 1]
+        )
+
+    def get_context_data(self, **kwargs):
+        breeds = list(self.object_list)
+        next_after = None
+        if len(breeds) > settings.CATS_BREEDS_PAGE_SIZE:
+            breeds = breeds[:-1]
+            next_after = breeds[-1].pk
+        facets = None
+        if not self.after:
+            # Later pages only append names; the counts are already shown.
+            facets = get_facet_index().counts(self.filter_form.cleaned_data)
+        return super().get_context_data(
+            object_list=breeds,
+            next_after=next_after,
+            details_batch_size=settings.CATS_BREEDS_PAGE_SIZE,
+            filter_form=self.filter_form,
+            filter_query=self.filter_form.query_string(),
+            facets=facets,
+            **kwargs,
+        )
+
+    def get_template_names(self):
+        if self.is_fragment:
+            return [self.fragment_template_name]
+        return [self.template_name]
 
 
+class BreedSearchView(ListView):
+    """
+    Breeds best matching ``q``, with the matches highlighted, swapped in for
+    the list as the visitor types. Without ``q`` the list comes back.
+    """
+
+    template_name = "breeds/partials/search_results.html"
+    context_object_name = "breeds"
+
+    def get(self, request, *args, **kwargs):
+        self.query = request.GET.get("q", "").strip()
+        if not self.query:
+            return BreedsListView.as_view()(request)
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        breeds = search_breeds(
+            self.query, Breed.objects.only("id", "external_id", "name", "description")
+        )
+        return breeds[: settings.CATS_BREEDS_SEARCH_LIMIT]
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(query=self.query, **kwargs)
+
+
+def detail_cache_key(pk, version, fmt):
+    return f"breeds:detail:{pk}:{version}:{fmt}"
+
+
+# Image URLs are picked according to the formats the browser accepts.
+@method_decorator(vary_on_headers("Accept"), name="dispatch")
 class BreedDetailView(DetailView):
+    """
+    Detail partial of a breed. Every change bumps ``Breed.version``, which
+    keys both the ETag and the cache of rendered fragments: a repeat click
+    costs one indexed lookup and answers 304 or a cached fragment.
+    """
+
     model = Breed
+    queryset = Breed.objects.select_related("image").prefetch_related("image__variants")
     template_name = "breeds/partials/detail.html"
     context_object_name = "breed"
 
+    def get(self, request, *args, **kwargs):
+        meta = (
+            Breed.objects.filter(pk=kwargs["pk"])
+            .values("version", "updated_at")
+            .first()
+        )
+        if meta is None:
+            raise Http404("Breed not found.")
+        fmt = preferred_format(request.META.get("HTTP_ACCEPT", ""))
+        etag = quote_etag(f"{kwargs['pk']}-{meta['version']}-{fmt}")
+        last_modified = int(meta["updated_at"].timestamp())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            key = detail_cache_key(kwargs["pk"], meta["version"], fmt)
+            content = cache.get(key)
+            if content is None:
+                response = super().get(request, *args, **kwargs)
+                response.render()
+                cache.set(key, response.content, settings.CATS_BREEDS_CACHE_TIMEOUT)
+            else:
+                response = HttpResponse(content)
+        response.headers.setdefault("ETag", etag)
+        response.headers.setdefault("Last-Modified", http_date(last_modified))
+        return response
+
+
+@method_decorator(vary_on_headers("Accept"), name="dispatch")
+class BreedDetailsBatchView(View):
+    """
+    Rendered detail partials for a batch of breeds, as ``{pk: html}``, so the
+    list can prefetch what is on screen. Fragments come from the cache shared
+    with ``BreedDetailView``; only the missing ones are loaded, in one query.
+    """
 
+    template_name = BreedDetailView.template_name
+
+    def get(self, request):
+        try:
+            pks = {int(pk) for pk in request.GET.get("ids", "").split(",") if pk}
+        except ValueError:
+            return HttpResponseBadRequest("ids must be comma separated integers.")
+        if len(pks) > settings.CATS_BREEDS_PAGE_SIZE:
+            return HttpResponseBadRequest(
+                f"At most {settings.CATS_BREEDS_PAGE_SIZE} ids per request."
+            )
+        if not pks:
+            return JsonResponse({})
+
+        fmt = preferred_format(request.META.get("HTTP_ACCEPT", ""))
+        versions = dict(Breed.objects.filter(pk__in=pks).values_list("pk", "version"))
+        keys = {
+            pk: detail_cache_key(pk, version, fmt) for pk, version in versions.items()
+        }
+        cached = cache.get_many(keys.values())
+        fragments = {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+        missing = BreedDetailView.queryset.filter(pk__in=versions.keys() - fragments)
+        rendered = {}
+        for breed in missing:
+            content = render_to_string(
+                self.template_name, {"breed": breed}, request=request
+            ).encode()
+            fragments[breed.pk] = content
+            rendered[detail_cache_key(breed.pk, breed.version, fmt)] = content
+        cache.set_many(rendered, settings.CATS_BREEDS_CACHE_TIMEOUT)
+
+        return JsonResponse({pk: content.decode() for pk, content in fragments.items()})
+
+
+@method_decorator(vary_on_headers("Accept"), name="dispatch")
 class HomeView(View):
+    """
+    Home page; the random-cats deck is fetched in windows from the ring
+    published by the sync, so rendering does not depend on the number of
+    images.
+    """
+
     template_name = "pages/home.html"
 
     def get(self, request, *args, **kwargs):
-        images = [obj.image.url for obj in Image.objects.all()]
+        fmt = preferred_format(request.META.get("HTTP_ACCEPT", ""))
+        try:
+            manifest = current_manifest()
+        except RedisError:
+            logger.warning("Random deck unavailable, Redis is down.")
+            manifest = None
         response = render(
             request,
             template_name=self.template_name,
-            context={"images": images},
+            context={
+                "image_count": manifest["count"] if manifest else 0,
+                "deck_url": (
+                    reverse("random-images", args=[manifest["version"], fmt])
+                    if manifest
+                    else ""
+                ),
+            },
+        )
+        return response
+
+
+class RandomImagesView(View):
+    """
+    ``count`` random-cats entries from ``cursor`` on, skipping images the
+    visitor has already been served according to their seen filter.
+    """
+
+    cookie_name = "cats_deck"
+
+    def get(self, request, version, fmt):
+        if fmt not in supported_formats():
+            raise Http404(f"Unsupported format {fmt}.")
+        try:
+            cursor = int(request.GET.get("cursor", 0))
+            count = int(request.GET.get("count", settings.CATS_RANDOM_BATCH_SIZE))
+        except ValueError:
+            return HttpResponseBadRequest("cursor and count must be integers.")
+        count = max(1, min(count, settings.CATS_RANDOM_BATCH_SIZE))
+
+        token = request.COOKIES.get(self.cookie_name)
+        # Clients that never send the cookie back would leave a filter behind
+        # on every request; only a returning visitor's is kept for long.
+        ttl = settings.CATS_SEEN_FILTER_TTL
+        if not token:
+            token = secrets.token_urlsafe(16)
+            ttl = settings.CATS_SEEN_FILTER_NEW_TTL
+        seen = RedisBloomFilter(
+            get_redis(),
+            key=f"seen:{token}",
+            bits=settings.CATS_SEEN_FILTER_BITS,
+            hashes=settings.CATS_SEEN_FILTER_HASHES,
+            ttl=ttl,
+        )
+        result = sample(version, fmt, cursor, count, seen=seen)
+        if result is None:
+            raise Http404("Unknown random deck.")
+        entries, next_cursor = result
+
+        # Entries are stored as JSON already; splice them in as they are.
+        content = f'{{"next":{next_cursor},"images":[{",".join(entries)}]}}'
+        response = HttpResponse(content, content_type="application/json")
+        # Depends on what this visitor has seen, so never shared or reused.
+        response["Cache-Control"] = "private, no-store"
+        response.set_cookie(
+            self.cookie_name,
+            token,
+            max_age=settings.CATS_SEEN_FILTER_TTL,
+            httponly=True,
+            samesite="Lax",
         )
         return response
+
+
+class VoteView(View):
+    """
+    Record a like or hate swipe on a random-cats image. Votes are buffered in
+    Redis and written to the database by the ``flush_votes`` task.
+    """
+
+    def post(self, request):
+        action = request.POST.get("action")
+        try:
+            image_pk = int(request.POST.get("image", ""))
+        except ValueError:
+            return HttpResponseBadRequest("image must be an integer.")
+        if action not in VOTE_ACTIONS:
+            return HttpResponseBadRequest(f"action must be one of {VOTE_ACTIONS}.")
+        try:
+            if not in_deck(current_manifest()["version"], image_pk):
+                raise Http404("Unknown image.")
+            record_vote(image_pk, action)
+        except RedisError:
+            logger.warning("Vote dropped, Redis is down.")
+            return HttpResponse("Voting is unavailable.", status=503)
+        return HttpResponse(status=204)
+
+
+@method_decorator(vary_on_headers("Accept"), name="dispatch")
+class MostLikedView(View):
+    """Most liked random-cats images, ranked from the live vote counts."""
+
+    def get(self, request):
+        try:
+            count = int(request.GET.get("count", 10))
+        except ValueError:
+            return HttpResponseBadRequest("count must be an integer.")
+        count = max(1, min(count, settings.CATS_RANDOM_BATCH_SIZE))
+
+        fmt = preferred_format(request.META.get("HTTP_ACCEPT", ""))
+        try:
+            ranking = dict(most_liked(count))
+            version = current_manifest()["version"]
+            entries = deck_entries(version, fmt, list(ranking))
+        except RedisError:
+            logger.warning("Most liked ranking unavailable, Redis is down.")
+            return JsonResponse({"images": []})
+        images = [
+            {**entry, "likes": ranking[entry["id"]]}
+            for entry in map(json.loads, entries)
+        ]
+        return JsonResponse({"images": images})
+
+
+class ImageResizeView(View):
+    """
+    Serve ``image`` scaled to fit in ``width`` x ``height``, rendered on the
+    first request and kept in a bounded local disk cache afterwards.
+    """
+
+    def get(self, request, pk, width, height, fmt):
+        max_dimension = settings.CATS_RESIZE_MAX_DIMENSION
+        if fmt not in supported_formats():
+            raise Http404(f"Unsupported format {fmt}.")
+        if not (0 < width <= max_dimension and 0 < height <= max_dimension):
+            raise Http404(f"Size {width}x{height} out of range.")
+
+        image = get_object_or_404(Image.objects.only("image", "checksum"), pk=pk)
+        if not image.image:
+            raise Http404("Image not downloaded yet.")
+
+        cache = get_disk_cache(
+            settings.CATS_RESIZE_CACHE_DIR, settings.CATS_RESIZE_CACHE_MAX_BYTES
+        )
+        # Keyed on the content so a replaced original never serves stale pixels.
+        key = f"{image.checksum or image.image.name}/{width}x{height}.{fmt}"
+        try:
+            f, created = cache.get_or_create(
+                key, lambda: render_resized(image, width, height, fmt)
+            )
+        except (OSError, UnidentifiedImageError):
+            raise Http404("Image could not be decoded.")
+
+        response = FileResponse(f, content_type=FORMAT_MIME_TYPES[fmt])
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+        response["X-Cache"] = "MISS" if created else "HIT"
+        return response
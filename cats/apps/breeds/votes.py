@@ -0,0 +1,131 @@
+import logging
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from cats.apps.breeds.models import Breed, Image, VoteBatch
+from cats.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+VOTE_ACTIONS = ("like", "hate")
+# Hash of "<image pk>:<action>" -> swipes not yet written to the database.
+PENDING_KEY = "votes:pending"
+# The pending hash being written out; left behind if a flush fails.
+FLUSHING_KEY = "votes:flushing"
+# Field of the flushing hash holding its batch id.
+BATCH_FIELD = "batch"
+# Held for the whole flush; expires in case the worker dies.
+FLUSH_LOCK_KEY = "votes:flush-lock"
+FLUSH_LOCK_TIMEOUT = 5 * 60
+# Applied batch ids are kept this long to recognise replays.
+BATCH_RETENTION = timedelta(days=1)
+# Sorted set of image pks by likes.
+MOST_LIKED_KEY = "votes:most-liked"
+
+
+def record_vote(image_pk, action):
+    """Buffer a swipe in Redis; it reaches the database on the next flush."""
+    pipe = get_redis().pipeline(transaction=False)
+    pipe.hincrby(PENDING_KEY, f"{image_pk}:{action}", 1)
+    if action == "like":
+        pipe.zincrby(MOST_LIKED_KEY, 1, image_pk)
+    pipe.execute()
+
+
+def increments(counts, key="pk"):
+    """``update()`` kwargs adding ``counts[pk][action]`` to each row."""
+    return {
+        f"{action}s": F(f"{action}s")
+        + Case(
+            *(
+                When(**{key: pk}, then=Value(by_action[action]))
+                for pk, by_action in counts.items()
+                if by_action[action]
+            ),
+            default=Value(0),
+        )
+        for action in VOTE_ACTIONS
+        if any(by_action[action] for by_action in counts.values())
+    }
+
+
+def flush_votes():
+    """
+    Add the buffered swipes to the image and breed counters, one UPDATE per
+    table. Returns the number of swipes written.
+
+    Runs are serialised by a Redis lock; a run finding it taken does nothing.
+    Each batch gets an id, recorded in the same transaction as the counters,
+    so a batch replayed after a crash between that commit and its deletion
+    from Redis is dropped instead of counted twice.
+    """
+    redis = get_redis()
+    lock = redis.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT, blocking=False)
+    if not lock.acquire():
+        logger.info("Votes are already being flushed.")
+        return 0
+    try:
+        return _flush_batch(redis)
+    finally:
+        lock.release()
+
+
+def _flush_batch(redis):
+    if not redis.exists(FLUSHING_KEY):
+        if not redis.exists(PENDING_KEY):
+            # Nothing buffered since the last flush.
+            return 0
+        # Only flushes, under the lock, ever remove the pending hash.
+        redis.rename(PENDING_KEY, FLUSHING_KEY)
+    # Kept from the first attempt when the batch is being retried.
+    redis.hsetnx(FLUSHING_KEY, BATCH_FIELD, uuid.uuid4().hex)
+
+    batch = redis.hgetall(FLUSHING_KEY)
+    batch_id = batch.pop(BATCH_FIELD.encode(), b"").decode()
+    counts = defaultdict(lambda: dict.fromkeys(VOTE_ACTIONS, 0))
+    for field, value in batch.items():
+        pk, action = field.decode().split(":")
+        if action in VOTE_ACTIONS:
+            counts[int(pk)][action] += int(value)
+
+    with transaction.atomic():
+        # Runs are serialised by the lock; the unique constraint backs it up.
+        if VoteBatch.objects.filter(batch_id=batch_id).exists():
+            logger.warning(f"Vote batch {batch_id} was already applied.")
+            counts.clear()
+        else:
+            VoteBatch.objects.create(batch_id=batch_id)
+        if counts:
+            Image.objects.filter(pk__in=counts).update(**increments(counts))
+            Breed.objects.filter(image__in=counts).update(
+                **increments(counts, key="image")
+            )
+        VoteBatch.objects.filter(
+            created_at__lt=timezone.now() - BATCH_RETENTION
+        ).delete()
+    redis.delete(FLUSHING_KEY)
+
+    if not redis.exists(MOST_LIKED_KEY):
+        # Redis lost the ranking; rebuild it from the flushed counters.
+        ranking = dict(Image.objects.filter(likes__gt=0).values_list("pk", "likes"))
+        if ranking:
+            redis.zadd(MOST_LIKED_KEY, ranking)
+
+    total = sum(sum(by_action.values()) for by_action in counts.values())
+    logger.info(f"Flushed {total} votes for {len(counts)} images.")
+    return total
+
+
+def most_liked(count=10):
+    """``(image pk, likes)`` of the most liked images, best first."""
+    return [
+        (int(pk), int(score))
+        for pk, score in get_redis().zrevrange(
+            MOST_LIKED_KEY, 0, count - 1, withscores=True
+        )
+    ]
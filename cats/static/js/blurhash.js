@@ -0,0 +1,80 @@
+// Decodes blurhash placeholders (https://blurha.sh) into data URLs and paints
+// them behind every element carrying a data-blurhash attribute.
+const BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+function decode83(str) {
+  let value = 0
+  for (const c of str) value = value * 83 + BASE83.indexOf(c)
+  return value
+}
+
+function srgbToLinear(value) {
+  const v = value / 255
+  return v <= 0.04045 ? v / 12.92 : Math.pow((v + 0.055) / 1.055, 2.4)
+}
+
+function linearToSrgb(value) {
+  const v = Math.max(0, Math.min(1, value))
+  return v <= 0.0031308
+    ? Math.round(v * 12.92 * 255)
+    : Math.round((1.055 * Math.pow(v, 1 / 2.4) - 0.055) * 255)
+}
+
+function signPow(value, exp) {
+  return Math.sign(value) * Math.pow(Math.abs(value), exp)
+}
+
+function blurhashToDataURL(hash, width = 32, height = 32) {
+  const sizeFlag = decode83(hash[0])
+  const numX = (sizeFlag % 9) + 1
+  const numY = Math.floor(sizeFlag / 9) + 1
+  const maximum = (decode83(hash[1]) + 1) / 166
+
+  const colors = []
+  for (let i = 0; i < numX * numY; i++) {
+    if (i === 0) {
+      const value = decode83(hash.substring(2, 6))
+      colors.push([value >> 16, (value >> 8) & 255, value & 255].map(srgbToLinear))
+    } else {
+      const value = decode83(hash.substring(4 + i * 2, 6 + i * 2))
+      colors.push([
+        Math.floor(value / (19 * 19)),
+        Math.floor(value / 19) % 19,
+        value % 19,
+      ].map(q => signPow((q - 9) / 9, 2) * maximum))
+    }
+  }
+
+  const canvas = document.createElement("canvas")
+  canvas.width = width
+  canvas.height = height
+  const ctx = canvas.getContext("2d")
+  const imageData = ctx.createImageData(width, height)
+  for (let y = 0; y < height; y++) {
+    for (let x = 0; x < width; x++) {
+      const pixel = [0, 0, 0]
+      for (let j = 0; j < numY; j++) {
+        for (let i = 0; i < numX; i++) {
+          const basis = Math.cos(Math.PI * x * i / width) * Math.cos(Math.PI * y * j / height)
+          const color = colors[i + j * numX]
+          for (let c = 0; c < 3; c++) pixel[c] += color[c] * basis
+        }
+      }
+      const offset = 4 * (x + y * width)
+      for (let c = 0; c < 3; c++) imageData.data[offset + c] = linearToSrgb(pixel[c])
+      imageData.data[offset + 3] = 255
+    }
+  }
+  ctx.putImageData(imageData, 0, 0)
+  return canvas.toDataURL()
+}
+
+function renderBlurhashes(root) {
+  root.querySelectorAll("[data-blurhash]").forEach(element => {
+    element.style.backgroundImage = `url(${blurhashToDataURL(element.dataset.blurhash)})`
+    element.style.backgroundSize = "cover"
+  })
+}
+
+// Runs on page load and on every fragment htmx swaps in.
+htmx.onLoad(renderBlurhashes)
@@ -1,11 +1,26 @@
 const frame = document.body.querySelector('.frame')
+const deck = document.querySelector('.random-cats').dataset
 
-let images = JSON.parse(document.getElementById('image-urls').textContent);
-let imgCount = images.length;
-const totalImages = images.length;
-images.forEach(image => appendCard(image))
+// Cards are fetched a window at a time from a random point of the ring, and
+// topped up as they are swiped, so only a handful of images load at once.
+const WINDOW = 5
+let cursor = Math.floor(Math.random() * Number(deck.deckSize))
+let loading = false
+let current = null
 
-let current = frame.querySelector('.card:last-child')
+function loadCards() {
+  if (loading || !deck.deckUrl) return
+  loading = true
+  fetch(`${deck.deckUrl}?cursor=${cursor}&count=${WINDOW}`)
+    .then(response => response.json())
+    .then(batch => {
+      cursor = batch.next
+      batch.images.forEach(image => appendCard(image))
+      current = current || frame.querySelector('.card:last-child')
+    })
+    .finally(() => loading = false)
+}
+loadCards()
 
 document.querySelector('#like').onclick = () => {
   moveX = 1
@@ -22,14 +37,18 @@ function appendCard(image) {
   const firstCard = frame.children[0]
   const newCard = document.createElement('div')
   newCard.className = 'card justify-content-end'
-  newCard.style.backgroundImage = `url(${image})`
+  newCard.dataset.imageId = image.id
+  // The placeholder sits under the photo and shows until it has loaded.
+  newCard.style.backgroundColor = image.color
+  newCard.style.backgroundImage = image.blurhash
+    ? `url(${image.url}), url(${blurhashToDataURL(image.blurhash)})`
+    : `url(${image.url})`
   if (firstCard) {
     frame.insertBefore(newCard, firstCard)
   }
   else {
     frame.appendChild(newCard)
   }
-  imgCount++
 }
 
 function setTransform(x, y, deg, duration) {
@@ -37,7 +56,18 @@ function setTransform(x, y, deg, duration) {
   if (duration) current.style.transition = `transform ${duration}ms`
 }
 
+function vote(imageId, action) {
+  const body = new URLSearchParams({image: imageId, action: action})
+  fetch(deck.voteUrl, {
+    method: 'POST',
+    headers: {'X-CSRFToken': deck.csrfToken},
+    body: body,
+  })
+}
+
 function complete(action) {
+    if (!current) return
+    vote(current.dataset.imageId, action === "likes" ? "like" : "hate")
     const style = window.getComputedStyle(current);
     const backgroundImage = style.backgroundImage;
     const regex = /url\(["']?(.*?)["']?\)/i;
@@ -58,7 +88,7 @@ function complete(action) {
 
     const prev = current
     current = current.previousElementSibling
-    appendCard(images[imgCount % totalImages ])
+    if (frame.children.length <= WINDOW) loadCards()
     setTimeout(() => frame.removeChild(prev), innerWidth)
 }
 
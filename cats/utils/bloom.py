@@ -0,0 +1,85 @@
+import hashlib
+
+# Return up to ARGV[3] of the candidates whose bits are not all set in the
+# bitmap at KEYS[1], setting their bits as they are picked. Each candidate
+# takes ARGV[2] bit offsets, flattened from ARGV[4] on; ARGV[1] is the TTL.
+CLAIM_SCRIPT = """
+local ttl = tonumber(ARGV[1])
+local hashes = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local picked = {}
+local candidates = (#ARGV - 3) / hashes
+for i = 0, candidates - 1 do
+    if #picked >= limit then
+        break
+    end
+    local base = 4 + i * hashes
+    local seen = true
+    for j = base, base + hashes - 1 do
+        if redis.call("GETBIT", KEYS[1], ARGV[j]) == 0 then
+            seen = false
+            break
+        end
+    end
+    if not seen then
+        for j = base, base + hashes - 1 do
+            redis.call("SETBIT", KEYS[1], ARGV[j], 1)
+        end
+        picked[#picked + 1] = i
+    end
+end
+if #picked > 0 then
+    redis.call("EXPIRE", KEYS[1], ttl)
+end
+return picked
+"""
+
+
+class RedisBloomFilter:
+    """
+    Bloom filter stored as a Redis bitmap of ``bits`` bits, expiring ``ttl``
+    seconds after the last addition.
+
+    Memory stays at ``bits / 8`` bytes however many items are added; the
+    price is a false positive rate that grows with them, roughly
+    ``(1 - e ** (-hashes * items / bits)) ** hashes``.
+    """
+
+    def __init__(self, redis, key, bits=2**14, hashes=4, ttl=30 * 24 * 60 * 60):
+        self.redis = redis
+        self.key = key
+        self.bits = bits
+        self.hashes = hashes
+        self.ttl = ttl
+        self.script = redis.register_script(CLAIM_SCRIPT)
+
+    def offsets(self, item):
+        # Double hashing: k offsets from two 64-bit halves of one digest.
+        digest = hashlib.blake2b(str(item).encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def claim(self, items, limit=None):
+        """
+        Items not seen before, up to ``limit``, in order; they count as seen
+        from now on.
+        """
+        items = list(items)
+        if not items:
+            return []
+        limit = len(items) if limit is None else limit
+        args = [self.ttl, self.hashes, limit]
+        for item in items:
+            args.extend(self.offsets(item))
+        picked = self.script(keys=[self.key], args=args)
+        return [items[i] for i in picked]
+
+    def __contains__(self, item):
+        pipe = self.redis.pipeline()
+        for offset in self.offsets(item):
+            pipe.getbit(self.key, offset)
+        return all(pipe.execute())
+
+    def clear(self):
+        self.redis.delete(self.key)
@@ -1,10 +1,21 @@
+import asyncio
+import hashlib
 import logging
 import re
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
 from urllib.error import HTTPError
+from urllib.parse import urlsplit
 
+import httpx
 import requests
 import requests_mock
+from requests.adapters import BaseAdapter
 from requests.sessions import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
 from requests_mock import create_response
 from urllib3 import Retry
 
@@ -116,8 +127,215 @@ class CatAPIMatcher:
         raise Exception(f"Unknown mock request received: {request_pattern}")
 
 
+def parse_retry_after(value, default=1):
+    """Seconds to wait according to a ``Retry-After`` header value."""
+    if not value:
+        return default
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimitedAdapter(BaseAdapter):
+    """
+    Take a token from ``limiter`` before every request sent through
+    ``adapter``. A 429 pauses the limiter for the ``Retry-After`` delay, so
+    every worker sharing it backs off, and the request is retried.
+    """
+
+    def __init__(self, adapter, limiter, retries=3):
+        super().__init__()
+        self.adapter = adapter
+        self.limiter = limiter
+        self.retries = retries
+
+    def close(self):
+        self.adapter.close()
+
+    def send(self, request, **kwargs):
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            response = self.adapter.send(request, **kwargs)
+            if response.status_code != 429 or attempt == self.retries:
+                return response
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            logger.warning(f"Cats API: throttled, pausing requests for {delay}s.")
+            self.limiter.pause(delay)
+        return response
+
+
+class LRUIndex:
+    """Cache keys by last access, kept in this process."""
+
+    def __init__(self):
+        self.keys = OrderedDict()
+        self.lock = threading.Lock()
+
+    def touch(self, key, max_entries):
+        """Mark ``key`` as just used; return the keys to evict beyond ``max_entries``."""
+        with self.lock:
+            self.keys[key] = None
+            self.keys.move_to_end(key)
+            evicted = []
+            while len(self.keys) > max_entries:
+                evicted.append(self.keys.popitem(last=False)[0])
+            return evicted
+
+
+class RedisLRUIndex:
+    """Cache keys by last access in a Redis sorted set, shared by every worker."""
+
+    def __init__(self, redis, key="cats-api:lru"):
+        self.redis = redis
+        self.key = key
+
+    def touch(self, key, max_entries):
+        """Mark ``key`` as just used; return the keys to evict beyond ``max_entries``."""
+        pipe = self.redis.pipeline()
+        pipe.zadd(self.key, {key: time.time()})
+        pipe.zrange(self.key, 0, -max_entries - 1)
+        pipe.zremrangebyrank(self.key, 0, -max_entries - 1)
+        _, evicted, _ = pipe.execute()
+        return [key.decode() for key in evicted]
+
+
+class CachingAdapter(BaseAdapter):
+    """
+    Conditional-request cache in front of another transport adapter.
+
+    Successful GET responses are stored in ``cache`` (any object with Django
+    cache style ``get``/``set``) together with their ``ETag`` and
+    ``Last-Modified`` validators. While an entry is fresh it is served
+    without touching the network; once stale it is revalidated with
+    ``If-None-Match``/``If-Modified-Since`` and a 304 is answered from the
+    cache. Freshness comes from the first ``(pattern, seconds)`` rule
+    matching the request path; entries are kept for ``max_age`` seconds.
+
+    With ``max_entries`` the cache holds at most that many responses: every
+    hit and store is recorded in ``index`` (an ``LRUIndex`` by default, a
+    ``RedisLRUIndex`` to share the bound between workers) and the least
+    recently used entries beyond the bound are deleted.
+    """
+
+    default_rules = [
+        # Random results, always revalidate.
+        (r"/v1/images/search", 0),
+        # Image metadata never changes once published.
+        (r"/v1/images/[^/]+$", 30 * 24 * 60 * 60),
+        (r"/v1/breeds", 60 * 60),
+    ]
+
+    def __init__(
+        self,
+        adapter,
+        cache,
+        rules=None,
+        max_age=30 * 24 * 60 * 60,
+        max_entries=None,
+        index=None,
+    ):
+        super().__init__()
+        self.adapter = adapter
+        self.cache = cache
+        self.max_entries = max_entries
+        self.index = index if index is not None else LRUIndex()
+        self.rules = [
+            (re.compile(pattern), ttl)
+            for pattern, ttl in (rules if rules is not None else self.default_rules)
+        ]
+        self.max_age = max_age
+
+    def close(self):
+        self.adapter.close()
+
+    def send(self, request, **kwargs):
+        if request.method != "GET":
+            return self.adapter.send(request, **kwargs)
+
+        key = "cats-api:" + hashlib.sha256(request.url.encode()).hexdigest()
+        entry = self.cache.get(key)
+        now = time.time()
+        if entry and now < entry["fresh_until"]:
+            logger.debug(f"Cats API cache hit: {request.url}")
+            self.touch(key)
+            return self.build_response(request, entry)
+
+        if entry:
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.adapter.send(request, **kwargs)
+        if response.status_code == 304 and entry:
+            logger.debug(f"Cats API cache revalidated: {request.url}")
+            entry["etag"] = response.headers.get("ETag", entry["etag"])
+            entry["last_modified"] = response.headers.get(
+                "Last-Modified", entry["last_modified"]
+            )
+            entry["fresh_until"] = now + self.ttl(request)
+            self.cache.set(key, entry, timeout=self.max_age)
+            self.touch(key)
+            return self.build_response(request, entry)
+
+        if response.status_code == 200:
+            self.cache.set(
+                key,
+                {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "headers": dict(response.headers),
+                    "content": response.content,
+                    "fresh_until": now + self.ttl(request),
+                },
+                timeout=self.max_age,
+            )
+            self.touch(key)
+        return response
+
+    def touch(self, key):
+        if self.max_entries is None:
+            return
+        evicted = self.index.touch(key, self.max_entries)
+        if evicted:
+            self.cache.delete_many(evicted)
+            logger.debug(f"Cats API cache: evicted {len(evicted)} entries.")
+
+    def ttl(self, request):
+        path = urlsplit(request.url).path
+        for pattern, ttl in self.rules:
+            if pattern.search(path):
+                return ttl
+        return 0
+
+    def build_response(self, request, entry):
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["content"]
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        return response
+
+
 class CatsAPIClient:
-    def __init__(self, host="", api_key=""):
+    def __init__(
+        self,
+        host="",
+        api_key="",
+        cache=None,
+        cache_rules=None,
+        cache_max_entries=None,
+        cache_index=None,
+        rate_limiter=None,
+    ):
         self.host = host
         self.api_key = api_key
         self.use_mocks = self.host.startswith("mock://")
@@ -126,18 +344,31 @@ class CatsAPIClient:
         session.hooks["response"] = [raise_and_log_error]
 
         if self.use_mocks:
-            mock_adapter = requests_mock.Adapter()
-            session.mount("mock://", mock_adapter)
-            mock_adapter.add_matcher(CatAPIMatcher())
+            prefix = "mock://"
+            adapter = requests_mock.Adapter(case_sensitive=True)
+            adapter.add_matcher(CatAPIMatcher())
         else:
+            prefix = self.host
             retry_strategy = Retry(
                 total=3,
-                status_forcelist=[429, 500, 503],
+                # 429s are left to RateLimitedAdapter when a limiter is set.
+                status_forcelist=[500, 503] if rate_limiter else [429, 500, 503],
                 allowed_methods=["GET", "POST"],
                 backoff_factor=2,
             )
             adapter = HTTPAdapter(max_retries=retry_strategy)
-            session.mount(self.host, adapter)
+
+        if rate_limiter is not None:
+            adapter = RateLimitedAdapter(adapter, rate_limiter)
+        if cache is not None:
+            adapter = CachingAdapter(
+                adapter,
+                cache,
+                rules=cache_rules,
+                max_entries=cache_max_entries,
+                index=cache_index,
+            )
+        session.mount(prefix, adapter)
 
         self.session = session
 
@@ -168,6 +399,161 @@ class CatsAPIClient:
         return data
 
 
+async def araise_and_log_error(response):
+    if response.is_error:
+        await response.aread()
+        logger.error(
+            "Got response with status code {}: {}".format(
+                response.status_code, response.text
+            )
+        )
+    response.raise_for_status()
+    return response
+
+
+class MockTransport(httpx.AsyncBaseTransport):
+    """Answer httpx requests through the same matcher the sync client mounts."""
+
+    def __init__(self):
+        self.adapter = requests_mock.Adapter(case_sensitive=True)
+        self.adapter.add_matcher(CatAPIMatcher())
+
+    async def handle_async_request(self, request):
+        prepared = requests.Request(
+            method=request.method,
+            url=str(request.url),
+            headers=dict(request.headers),
+        ).prepare()
+        response = self.adapter.send(prepared)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            content=response.content,
+            request=request,
+        )
+
+
+class AsyncCatsAPIClient:
+    """
+    Asyncio counterpart of ``CatsAPIClient``.
+
+    Connections are pooled and kept alive across calls, and at most
+    ``per_host_concurrency`` requests are in flight per host. Use it as an
+    async context manager, or call ``aclose`` when done.
+    """
+
+    retry_statuses = (429, 500, 503)
+
+    def __init__(
+        self,
+        host="",
+        api_key="",
+        max_connections=20,
+        max_keepalive_connections=10,
+        per_host_concurrency=10,
+        retries=3,
+        backoff_factor=2,
+        timeout=30,
+        transport=None,
+        rate_limiter=None,
+    ):
+        self.host = host
+        self.api_key = api_key
+        self.use_mocks = self.host.startswith("mock://")
+        self.per_host_concurrency = per_host_concurrency
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.rate_limiter = rate_limiter
+        self._semaphores = {}
+
+        if transport is None and self.use_mocks:
+            transport = MockTransport()
+        elif transport is None:
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                ),
+                retries=retries,
+            )
+
+        self.session = httpx.AsyncClient(
+            transport=transport,
+            timeout=timeout,
+            event_hooks={"response": [araise_and_log_error]},
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.session.aclose()
+
+    def _semaphore(self, url):
+        host = httpx.URL(url).host
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._semaphores[host]
+
+    async def acquire(self):
+        if self.rate_limiter is None:
+            return
+        while wait := self.rate_limiter.try_acquire():
+            await asyncio.sleep(wait)
+
+    async def request(self, method, url, **kwargs):
+        async with self._semaphore(url):
+            for attempt in range(self.retries + 1):
+                await self.acquire()
+                try:
+                    return await self.session.request(method, url, **kwargs)
+                except httpx.HTTPStatusError as exc:
+                    status_code = exc.response.status_code
+                    if (
+                        status_code not in self.retry_statuses
+                        or attempt == self.retries
+                    ):
+                        raise
+                    delay = self.backoff_factor * 2**attempt
+                    if status_code == 429 and self.rate_limiter is not None:
+                        delay = parse_retry_after(
+                            exc.response.headers.get("Retry-After"), delay
+                        )
+                        self.rate_limiter.pause(delay)
+                        # The limiter now holds every request back.
+                        continue
+                await asyncio.sleep(delay)
+
+    async def get_breeds(self, page=0, limit=10):
+        url = f"{self.host}/v1/breeds"
+        params = {"page": page, "limit": limit}
+
+        logger.info(f"Cats API: fetching breeds: {url} - {params}")
+        response = await self.request("GET", url=url, params=params)
+        data = response.json()
+        return data
+
+    async def get_image(self, image_id):
+        url = f"{self.host}/v1/images/{image_id}"
+
+        logger.info(f"Cats API: fetching image data: {url}")
+        response = await self.request("GET", url=url)
+        data = response.json()
+        return data
+
+    async def search_images(self, page=0, limit=10):
+        url = f"{self.host}/v1/images/search"
+        params = {"page": page, "limit": limit, "has_breeds": 1, "order": "DESC"}
+
+        logger.info(f"Cats API: fetching random images: {url} - {params}")
+        response = await self.request("GET", url=url, params=params)
+        data = response.json()
+        return data
+
+
 if __name__ == "__main__":
     host = "mock://api.thecatapi.com"
     api_key = ""
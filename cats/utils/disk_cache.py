@@ -0,0 +1,199 @@
+import fcntl
+import functools
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Builds lock one of this many files, picked by key, so locking leaves a
+# fixed number of files behind however many keys are requested.
+LOCK_STRIPES = 64
+LOCK_DIRECTORY = "locks"
+# Entries are written here first and moved into place, so a half-written
+# file is never mistaken for an entry, evicted or served.
+TMP_DIRECTORY = "tmp"
+# Seconds a process trusts its running size total before rescanning the
+# directory for entries written by other processes.
+RESCAN_INTERVAL = 60
+
+
+class DiskLRUCache:
+    """
+    Size-bounded cache of generated files on local disk.
+
+    Entries are evicted least recently used first (by modification time,
+    which hits refresh) once the directory grows past ``max_bytes``. The
+    size is tracked as entries are written and only rescanned when that
+    total goes over the bound or every ``rescan_interval`` seconds, so
+    other processes may overshoot it in between.
+    ``get_or_create`` holds a file lock while building an entry, so
+    concurrent misses for the same key, from any thread or process on the
+    host, wait for a single build instead of repeating it.
+
+    Entries are handed out as open files: another process may evict them at
+    any time, which an already open file survives.
+    """
+
+    def __init__(self, directory, max_bytes, rescan_interval=RESCAN_INTERVAL):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.rescan_interval = rescan_interval
+        self.hits = self.misses = self.evictions = 0
+        # Bytes on disk as of the last scan plus what this process wrote.
+        self.size = None
+        self.scanned_at = 0.0
+        self.counter_lock = threading.Lock()
+        os.makedirs(os.path.join(directory, TMP_DIRECTORY), exist_ok=True)
+
+    def path(self, key):
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        extension = os.path.splitext(key)[1]
+        return os.path.join(self.directory, digest[:2], digest + extension)
+
+    def get(self, key):
+        """The cached file of ``key`` opened for reading, or ``None``."""
+        try:
+            f = open(self.path(key), "rb")
+        except FileNotFoundError:
+            return None
+        os.utime(f.fileno())
+        self.count("hits")
+        return f
+
+    def get_or_create(self, key, build):
+        """
+        Return ``(file, created)`` for the cached file of ``key``, opened for
+        reading, calling ``build()`` for its bytes on a miss.
+        """
+        f = self.get(key)
+        if f is not None:
+            return f, False
+
+        with self.lock(key):
+            # Someone else may have built it while we waited for the lock.
+            f = self.get(key)
+            if f is not None:
+                return f, False
+
+            self.count("misses")
+            path = self.path(key)
+            content = build()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.join(self.directory, TMP_DIRECTORY)
+            )
+            f = os.fdopen(fd, "w+b")
+            try:
+                f.write(content)
+                f.flush()
+                os.replace(tmp_path, path)
+            except BaseException:
+                f.close()
+                os.remove(tmp_path)
+                raise
+            f.seek(0)
+            self.grow(len(content))
+
+        self.evict()
+        return f, True
+
+    @contextmanager
+    def lock(self, key):
+        stripe = int(hashlib.sha256(key.encode()).hexdigest(), 16) % LOCK_STRIPES
+        directory = os.path.join(self.directory, LOCK_DIRECTORY)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{stripe}.lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def entries(self):
+        for subdirectory in os.scandir(self.directory):
+            if not subdirectory.is_dir() or subdirectory.name in (
+                LOCK_DIRECTORY,
+                TMP_DIRECTORY,
+            ):
+                continue
+            for entry in os.scandir(subdirectory.path):
+                if entry.is_file():
+                    yield entry
+
+    def grow(self, amount):
+        with self.counter_lock:
+            if self.size is not None:
+                self.size += amount
+
+    def evict(self):
+        """
+        Drop least recently used entries until the cache fits again, if the
+        running size total says it may not, or it is due for a rescan.
+        """
+        with self.counter_lock:
+            due = (
+                self.size is None
+                or self.size > self.max_bytes
+                or time.monotonic() - self.scanned_at >= self.rescan_interval
+            )
+        if not due:
+            return 0
+
+        entries = []
+        for entry in self.entries():
+            try:
+                entries.append((entry.stat(), entry.path))
+            except FileNotFoundError:
+                # Evicted by someone else since it was listed.
+                continue
+        total = sum(stat.st_size for stat, _ in entries)
+        if total <= self.max_bytes:
+            self.rescanned(total)
+            return 0
+
+        evicted = 0
+        for stat, path in sorted(entries, key=lambda item: item[0].st_mtime):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= stat.st_size
+            evicted += 1
+        self.rescanned(total)
+        self.count("evictions", evicted)
+        logger.info(f"Disk cache {self.directory}: evicted {evicted} entries.")
+        return evicted
+
+    def rescanned(self, total):
+        with self.counter_lock:
+            self.size = total
+            self.scanned_at = time.monotonic()
+
+    def count(self, name, amount=1):
+        with self.counter_lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def stats(self):
+        """Counters of this process plus the current size of the cache."""
+        sizes = [entry.stat().st_size for entry in self.entries()]
+        return {
+            "entries": len(sizes),
+            "bytes": sum(sizes),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def get_disk_cache(directory, max_bytes):
+    """Process-wide cache per directory, so its stats survive requests."""
+    return DiskLRUCache(directory, max_bytes)
@@ -0,0 +1,126 @@
+import functools
+import logging
+import threading
+import time
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# Refill the bucket stored at KEYS[1] and take one token if available.
+# Returns the number of milliseconds to wait before a token (or the end of a
+# pause set through KEYS[2]) is available, 0 when a token was taken.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now_parts = redis.call("TIME")
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+
+local paused = redis.call("PTTL", KEYS[2])
+if paused > 0 then
+    return paused
+end
+
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate / 1000)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "ts", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity * 1000 / rate) + 1000)
+return wait
+"""
+
+
+class TokenBucket:
+    """
+    In-process token bucket allowing ``rate`` requests per second with bursts
+    of up to ``capacity``. Safe to share between threads.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated_at = clock()
+        self.paused_until = 0
+        self.lock = threading.Lock()
+
+    def try_acquire(self):
+        """Take a token, returning 0, or the seconds to wait for one."""
+        with self.lock:
+            now = self.clock()
+            if now < self.paused_until:
+                return self.paused_until - now
+
+            elapsed = now - self.updated_at
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        while wait := self.try_acquire():
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Stop handing out tokens for ``seconds``, e.g. after a 429."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+
+class RedisTokenBucket(TokenBucket):
+    """
+    Token bucket shared by every process using the same Redis ``key``.
+
+    Falls back to the in-process bucket while Redis is unavailable, so a
+    Redis outage degrades to per-worker limiting instead of failing requests.
+    """
+
+    def __init__(self, rate, capacity=None, url="", key="cats-api", **kwargs):
+        super().__init__(rate, capacity, **kwargs)
+        self.key = f"ratelimit:{key}"
+        self.pause_key = f"ratelimit:{key}:paused"
+        self.redis = redis.Redis.from_url(url, socket_timeout=1)
+        self.script = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def try_acquire(self):
+        try:
+            wait = self.script(
+                keys=[self.key, self.pause_key], args=[self.rate, self.capacity]
+            )
+        except redis.RedisError:
+            logger.warning("Rate limiter: Redis unavailable, limiting in-process.")
+            return super().try_acquire()
+        return wait / 1000
+
+    def pause(self, seconds):
+        super().pause(seconds)
+        try:
+            # Keep the longest pause if several workers got throttled.
+            ttl = max(int(seconds * 1000), 1)
+            if self.redis.pttl(self.pause_key) < ttl:
+                self.redis.set(self.pause_key, 1, px=ttl)
+        except redis.RedisError:
+            logger.warning("Rate limiter: Redis unavailable, pausing in-process.")
+
+
+def build_rate_limiter(rate, capacity=None, url="", key="cats-api"):
+    if url:
+        return RedisTokenBucket(rate, capacity, url=url, key=key)
+    return TokenBucket(rate, capacity)
+
+
+@functools.lru_cache(maxsize=None)
+def get_rate_limiter(rate, capacity=None, url="", key="cats-api"):
+    """Process-wide limiter, so clients created per task share one bucket."""
+    return build_rate_limiter(rate, capacity, url=url, key=key)
@@ -0,0 +1,14 @@
+import functools
+
+import redis
+from django.conf import settings
+
+
+@functools.lru_cache(maxsize=None)
+def connect(url):
+    return redis.Redis.from_url(url, socket_timeout=1)
+
+
+def get_redis():
+    """Shared connection pool to the Redis at ``CATS_REDIS_URL``."""
+    return connect(settings.CATS_REDIS_URL)
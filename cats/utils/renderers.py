@@ -0,0 +1,18 @@
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(BaseRenderer):
+    """JSON renderer backed by orjson, several times faster than the stdlib."""
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+    options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # DRF's encoder covers the types orjson does not know (lazy strings...).
+        return orjson.dumps(data, default=JSONEncoder().default, option=self.options)
@@ -8,4 +8,6 @@ class StaticRootS3Boto3Storage(S3Boto3Storage):
 
 class MediaRootS3Boto3Storage(S3Boto3Storage):
     location = "media"
-    file_overwrite = False
+    # Images are stored under their content hash, so a name clash always means
+    # identical bytes; overwriting skips the existence check on every save.
+    file_overwrite = True
@@ -0,0 +1,11 @@
+import pytest
+
+from cats.utils.redis_client import get_redis
+
+
+@pytest.fixture
+def redis_db():
+    redis = get_redis()
+    redis.flushdb()
+    yield redis
+    redis.flushdb()
@@ -0,0 +1,30 @@
+from cats.utils.bloom import RedisBloomFilter
+
+
+def test_claim_skips_seen_items(redis_db):
+    seen = RedisBloomFilter(redis_db, "seen:test")
+
+    assert seen.claim([1, 2, 3]) == [1, 2, 3]
+    assert seen.claim([2, 3, 4, 5, 6], limit=2) == [4, 5]
+    assert 5 in seen
+    assert 6 not in seen
+    assert seen.claim([1, 6]) == [6]
+
+
+def test_memory_and_ttl_are_bounded(redis_db):
+    seen = RedisBloomFilter(redis_db, "seen:test", bits=1024, hashes=3, ttl=60)
+
+    seen.claim(range(10000))
+
+    assert redis_db.strlen("seen:test") <= 1024 // 8
+    assert 0 < redis_db.ttl("seen:test") <= 60
+
+
+def test_false_positive_rate(redis_db):
+    seen = RedisBloomFilter(redis_db, "seen:test", bits=2**14, hashes=4)
+    seen.claim(range(2000))
+
+    false_positives = sum(item in seen for item in range(2000, 4000))
+
+    # (1 - e ** (-4 * 2000 / 2 ** 14)) ** 4 is about 2.2%.
+    assert false_positives / 2000 < 0.04
@@ -0,0 +1,242 @@
+import asyncio
+
+import httpx
+import pytest
+import requests
+import requests_mock
+from django.core.cache.backends.locmem import LocMemCache
+
+from cats.utils.client import (
+    AsyncCatsAPIClient,
+    CachingAdapter,
+    CatsAPIClient,
+    MockTransport,
+    RedisLRUIndex,
+)
+from cats.utils.ratelimit import TokenBucket
+
+CAT_API_HOST = "mock://api.thecatapi.com"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_async_get_breeds():
+    async def main():
+        async with AsyncCatsAPIClient(host=CAT_API_HOST) as client:
+            return await client.get_breeds(limit=1)
+
+    breeds = run(main())
+    assert breeds[0]["id"] == "aege"
+
+
+def test_async_get_image():
+    async def main():
+        async with AsyncCatsAPIClient(host=CAT_API_HOST) as client:
+            return await client.get_image("ozEvzdVM-")
+
+    assert run(main())["id"] == "ozEvzdVM-"
+
+
+def test_async_search_images():
+    async def main():
+        async with AsyncCatsAPIClient(host=CAT_API_HOST) as client:
+            return await client.search_images()
+
+    assert run(main())[0]["id"] == "j5cVSqLer"
+
+
+def test_async_concurrent_requests_are_bounded():
+    in_flight = peak = 0
+
+    class CountingTransport(httpx.AsyncBaseTransport):
+        def __init__(self, transport):
+            self.transport = transport
+
+        async def handle_async_request(self, request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await self.transport.handle_async_request(request)
+
+    async def main():
+        transport = CountingTransport(MockTransport())
+        async with AsyncCatsAPIClient(
+            host=CAT_API_HOST, per_host_concurrency=3, transport=transport
+        ) as client:
+            return await asyncio.gather(
+                *(client.get_image(f"image-{i}") for i in range(10))
+            )
+
+    images = run(main())
+    assert [image["id"] for image in images] == [f"image-{i}" for i in range(10)]
+    assert peak == 3
+
+
+def test_async_retries_throttled_requests():
+    responses = iter([429, 200])
+
+    def handler(request):
+        return httpx.Response(next(responses), json={"id": "abc"})
+
+    async def main():
+        transport = httpx.MockTransport(handler)
+        async with AsyncCatsAPIClient(
+            host=CAT_API_HOST, backoff_factor=0, transport=transport
+        ) as client:
+            return await client.get_image("abc")
+
+    assert run(main()) == {"id": "abc"}
+
+
+def test_async_raises_client_errors():
+    def handler(request):
+        return httpx.Response(404, json={})
+
+    async def main():
+        transport = httpx.MockTransport(handler)
+        async with AsyncCatsAPIClient(host=CAT_API_HOST, transport=transport) as client:
+            await client.get_image("abc")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run(main())
+
+
+@pytest.fixture
+def cache():
+    cache = LocMemCache("cats-api-tests", {})
+    yield cache
+    cache.clear()
+
+
+@pytest.fixture
+def upstream():
+    adapter = requests_mock.Adapter(case_sensitive=True)
+
+    def breeds(request, context):
+        context.headers["ETag"] = '"v1"'
+        if request.headers.get("If-None-Match") == '"v1"':
+            context.status_code = 304
+            return None
+        return [{"id": "aege"}]
+
+    adapter.register_uri("GET", "mock://api/v1/breeds", json=breeds)
+    adapter.register_uri(
+        "GET",
+        "mock://api/v1/images/abc",
+        json={"id": "abc"},
+        headers={"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"},
+    )
+    return adapter
+
+
+def make_session(upstream, cache, rules=None):
+    session = requests.Session()
+    session.mount("mock://", CachingAdapter(upstream, cache, rules=rules))
+    return session
+
+
+def test_caching_adapter_serves_fresh_entries(upstream, cache):
+    session = make_session(upstream, cache)
+
+    first = session.get("mock://api/v1/images/abc")
+    second = session.get("mock://api/v1/images/abc")
+
+    assert first.json() == second.json() == {"id": "abc"}
+    assert upstream.call_count == 1
+
+
+def test_caching_adapter_revalidates_stale_entries(upstream, cache):
+    session = make_session(upstream, cache, rules=[(r"/v1/breeds", 0)])
+
+    first = session.get("mock://api/v1/breeds")
+    second = session.get("mock://api/v1/breeds")
+
+    assert upstream.call_count == 2
+    assert upstream.last_request.headers["If-None-Match"] == '"v1"'
+    assert second.status_code == 200
+    assert second.json() == first.json() == [{"id": "aege"}]
+
+
+def test_caching_adapter_sends_if_modified_since(upstream, cache):
+    session = make_session(upstream, cache, rules=[])
+
+    session.get("mock://api/v1/images/abc")
+    session.get("mock://api/v1/images/abc")
+
+    assert (
+        upstream.last_request.headers["If-Modified-Since"]
+        == "Wed, 21 Oct 2015 07:28:00 GMT"
+    )
+
+
+def test_caching_adapter_skips_errors(upstream, cache):
+    upstream.register_uri("GET", "mock://api/v1/images/missing", status_code=404)
+    session = make_session(upstream, cache)
+
+    session.get("mock://api/v1/images/missing")
+    session.get("mock://api/v1/images/missing")
+
+    assert upstream.call_count == 2
+
+
+def test_client_with_cache(cache):
+    client = CatsAPIClient(host=CAT_API_HOST, cache=cache)
+
+    assert client.get_image("abc") == client.get_image("abc")
+    assert client.get_breeds()[0]["id"] == "aege"
+
+
+def test_async_throttled_requests_pause_the_rate_limiter():
+    responses = iter(
+        [httpx.Response(429, headers={"Retry-After": "0"}), httpx.Response(200)]
+    )
+    limiter = TokenBucket(rate=100)
+
+    def handler(request):
+        return next(responses)
+
+    async def main():
+        transport = httpx.MockTransport(handler)
+        async with AsyncCatsAPIClient(
+            host=CAT_API_HOST, transport=transport, rate_limiter=limiter
+        ) as client:
+            return await client.request("GET", f"{CAT_API_HOST}/v1/breeds")
+
+    assert run(main()).status_code == 200
+    assert limiter.tokens < 99
+
+
+def test_caching_adapter_evicts_least_recently_used(upstream, cache):
+    upstream.register_uri("GET", "mock://api/v1/images/def", json={"id": "def"})
+    session = requests.Session()
+    session.mount("mock://", CachingAdapter(upstream, cache, max_entries=2))
+
+    session.get("mock://api/v1/images/abc")
+    session.get("mock://api/v1/breeds")
+    # A hit makes "abc" the most recently used entry...
+    session.get("mock://api/v1/images/abc")
+    # ...so storing a third response drops the breeds instead.
+    session.get("mock://api/v1/images/def")
+    session.get("mock://api/v1/images/abc")
+    session.get("mock://api/v1/breeds")
+
+    assert [request.path for request in upstream.request_history] == [
+        "/v1/images/abc",
+        "/v1/breeds",
+        "/v1/images/def",
+        "/v1/breeds",
+    ]
+
+
+def test_redis_lru_index(redis_db):
+    index = RedisLRUIndex(redis_db)
+
+    assert index.touch("a", 2) == []
+    assert index.touch("b", 2) == []
+    assert index.touch("a", 2) == []
+    assert index.touch("c", 2) == ["b"]
+    assert redis_db.zcard(index.key) == 2
@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from unittest.mock import patch
+
+from cats.utils.disk_cache import LOCK_STRIPES, TMP_DIRECTORY, DiskLRUCache
+
+
+def cached(cache, key):
+    """The cached bytes of ``key``, or ``None``."""
+    f = cache.get(key)
+    if f is None:
+        return None
+    with f:
+        return f.read()
+
+
+def test_get_or_create_builds_once(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024)
+
+    f, created = cache.get_or_create("a.jpg", lambda: b"meow")
+    with f:
+        assert created
+        assert f.read() == b"meow"
+
+    f, created = cache.get_or_create("a.jpg", lambda: b"purr")
+    with f:
+        assert not created
+        assert f.read() == b"meow"
+    assert cache.stats() == {
+        "entries": 1,
+        "bytes": 4,
+        "max_bytes": 1024,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+    }
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=10)
+    cache.get_or_create("a", lambda: b"aaaa")[0].close()
+    time.sleep(0.01)
+    cache.get_or_create("b", lambda: b"bbbb")[0].close()
+    time.sleep(0.01)
+    # Reading "a" makes "b" the least recently used entry.
+    cached(cache, "a")
+    time.sleep(0.01)
+
+    cache.get_or_create("c", lambda: b"cccc")[0].close()
+
+    assert cached(cache, "a") == b"aaaa"
+    assert cached(cache, "b") is None
+    assert cached(cache, "c") == b"cccc"
+    assert cache.evictions == 1
+    assert cache.stats()["bytes"] == 8
+
+
+def test_entry_survives_eviction_once_handed_out(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=4)
+    f, _ = cache.get_or_create("a", lambda: b"aaaa")
+
+    # Another request pushes "a" out before the first one is served.
+    cache.get_or_create("b", lambda: b"bbbb")[0].close()
+
+    with f:
+        assert f.read() == b"aaaa"
+    assert cached(cache, "a") is None
+
+
+def test_misses_leave_a_bounded_number_of_files(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=100)
+
+    for i in range(2 * LOCK_STRIPES):
+        cache.get_or_create(f"{i}.jpg", lambda: b"x" * 100)[0].close()
+
+    files = [name for _, _, names in os.walk(tmp_path) for name in names]
+    assert cache.stats()["entries"] == 1
+    assert len(files) <= 1 + LOCK_STRIPES
+
+
+def test_eviction_skips_files_being_written(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=4)
+    # Another process is halfway through writing an entry.
+    writing = tmp_path / TMP_DIRECTORY / "tmpabc"
+    writing.write_bytes(b"x" * 100)
+
+    cache.get_or_create("a", lambda: b"aaaa")[0].close()
+
+    assert writing.exists()
+    assert cache.stats()["bytes"] == 4
+
+
+def test_misses_rescan_only_when_over_budget(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=10)
+
+    with patch.object(cache, "entries", wraps=cache.entries) as entries:
+        for key in "abc":
+            cache.get_or_create(key, lambda: b"xxx")[0].close()
+        assert entries.call_count == 1
+
+        cache.get_or_create("d", lambda: b"xxx")[0].close()
+        assert entries.call_count == 2
+    assert cache.evictions == 1
+
+
+def test_concurrent_misses_are_coalesced(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024)
+    builds = []
+
+    def build():
+        builds.append(1)
+        time.sleep(0.1)
+        return b"meow"
+
+    def get():
+        cache.get_or_create("a", build)[0].close()
+
+    threads = [threading.Thread(target=get) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert cache.misses == 1
+    assert cache.hits == 4
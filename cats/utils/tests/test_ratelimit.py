@@ -0,0 +1,112 @@
+import pytest
+import requests
+import requests_mock
+
+from cats.utils.client import RateLimitedAdapter, parse_retry_after
+from cats.utils.ratelimit import RedisTokenBucket, TokenBucket, build_rate_limiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_token_bucket_bursts_then_refills(clock):
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+    clock.now = 0.5
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+
+def test_token_bucket_pause(clock):
+    bucket = TokenBucket(rate=10, clock=clock)
+
+    bucket.pause(5)
+    assert bucket.try_acquire() == pytest.approx(5)
+
+    clock.now = 5
+    assert bucket.try_acquire() == 0
+
+
+def test_redis_token_bucket_falls_back_in_process(clock):
+    bucket = RedisTokenBucket(
+        rate=1, capacity=1, url="redis://127.0.0.1:1/0", clock=clock
+    )
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(1)
+    bucket.pause(3)
+    assert bucket.try_acquire() == pytest.approx(3)
+
+
+def test_build_rate_limiter():
+    assert type(build_rate_limiter(5)) is TokenBucket
+    assert type(build_rate_limiter(5, url="redis://127.0.0.1:1/0")) is RedisTokenBucket
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("3", 3), ("0.5", 0.5), (None, 1), ("garbage", 1), ("-2", 0)],
+)
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.acquired = 0
+        self.pauses = []
+
+    def acquire(self):
+        self.acquired += 1
+
+    def pause(self, seconds):
+        self.pauses.append(seconds)
+
+
+def test_rate_limited_adapter_honors_retry_after():
+    upstream = requests_mock.Adapter()
+    upstream.register_uri(
+        "GET",
+        "mock://api/v1/breeds",
+        [
+            {"status_code": 429, "headers": {"Retry-After": "7"}},
+            {"json": [{"id": "aege"}]},
+        ],
+    )
+    limiter = RecordingLimiter()
+    session = requests.Session()
+    session.mount("mock://", RateLimitedAdapter(upstream, limiter))
+
+    response = session.get("mock://api/v1/breeds")
+
+    assert response.json() == [{"id": "aege"}]
+    assert limiter.acquired == 2
+    assert limiter.pauses == [7]
+
+
+def test_rate_limited_adapter_gives_up():
+    upstream = requests_mock.Adapter()
+    upstream.register_uri("GET", "mock://api/v1/breeds", status_code=429)
+    limiter = RecordingLimiter()
+    session = requests.Session()
+    session.mount("mock://", RateLimitedAdapter(upstream, limiter, retries=2))
+
+    assert session.get("mock://api/v1/breeds").status_code == 429
+    assert limiter.acquired == 3
@@ -1,6 +1,7 @@
 from django.conf import settings
 from rest_framework.routers import DefaultRouter, SimpleRouter
 
+from cats.apps.breeds.api.views import BreedViewSet, ImageViewSet
 from cats.apps.users.api.views import UserViewSet
 
 if settings.DEBUG:
@@ -9,6 +10,8 @@ else:
     router = SimpleRouter()
 
 router.register("users", UserViewSet)
+router.register("breeds", BreedViewSet)
+router.register("images", ImageViewSet)
 
 
 app_name = "api"
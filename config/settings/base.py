@@ -335,3 +335,61 @@ SPECTACULAR_SETTINGS = {
 CATS_API_HOST = env("CATS_API_HOST", default="mock://api.thecatapi.com")
 CATS_API_KEY = env("CATS_API_KEY", default="")
 CATS_API_DATA_LIMIT = env.int("CATS_API_DATA_LIMIT", default=10)
+# Alias in CACHES holding upstream API responses, empty to disable caching.
+CATS_API_CACHE = env("CATS_API_CACHE", default="")
+# Most upstream responses kept in it; the least recently used go first.
+CATS_API_CACHE_MAX_ENTRIES = env.int("CATS_API_CACHE_MAX_ENTRIES", default=10000)
+# Upstream requests per second shared by all workers (0 disables limiting),
+# the burst allowed on top, and the Redis holding the shared bucket. Without
+# Redis each process limits itself.
+CATS_API_RATE_LIMIT = env.float("CATS_API_RATE_LIMIT", default=10)
+CATS_API_RATE_LIMIT_BURST = env.int("CATS_API_RATE_LIMIT_BURST", default=10)
+CATS_API_RATE_LIMIT_REDIS_URL = env("REDIS_URL", default="")
+# Number of breeds written per transaction by the sync tasks.
+CATS_SYNC_CHUNK_SIZE = env.int("CATS_SYNC_CHUNK_SIZE", default=500)
+# Slices in a row the breeds sync may end without progress before it gives up
+# until its next scheduled run, and the delay before the first retry (doubled
+# for each further one).
+CATS_SYNC_MAX_STALLS = env.int("CATS_SYNC_MAX_STALLS", default=5)
+CATS_SYNC_STALL_BACKOFF = env.int("CATS_SYNC_STALL_BACKOFF", default=60)
+# Number of images fetched in parallel by the sync tasks.
+CATS_IMAGE_FETCH_CONCURRENCY = env.int("CATS_IMAGE_FETCH_CONCURRENCY", default=8)
+# Number of fetched images written per insert; an interrupted sync keeps them.
+CATS_IMAGE_FETCH_BATCH_SIZE = env.int("CATS_IMAGE_FETCH_BATCH_SIZE", default=20)
+# Bytes of each image download buffered in memory before spilling to disk.
+CATS_IMAGE_SPOOL_SIZE = env.int("CATS_IMAGE_SPOOL_SIZE", default=1024 * 1024)
+# Local directory and size bound of the on-demand resized image cache, and the
+# largest width/height it renders.
+CATS_RESIZE_CACHE_DIR = env("CATS_RESIZE_CACHE_DIR", default="/tmp/cats-resize-cache")
+CATS_RESIZE_CACHE_MAX_BYTES = env.int(
+    "CATS_RESIZE_CACHE_MAX_BYTES", default=256 * 1024 * 1024
+)
+CATS_RESIZE_MAX_DIMENSION = env.int("CATS_RESIZE_MAX_DIMENSION", default=2400)
+# Redis holding the random-cats deck, seen filters and vote buffers.
+CATS_REDIS_URL = env("REDIS_URL", default="redis://localhost:6379/0")
+# Most images the random-cats deck fetches per request.
+CATS_RANDOM_BATCH_SIZE = env.int("CATS_RANDOM_BATCH_SIZE", default=20)
+# Bloom filter of the images each random-cats visitor has been served: its size
+# in bits (memory per visitor is a bits / 8 bytes bitmap), hashes per image and
+# seconds it is kept after the visitor's last request. The defaults keep false
+# positives around 2% for 2000 images seen. A filter lives only
+# CATS_SEEN_FILTER_NEW_TTL seconds until its visitor sends the cookie back.
+CATS_SEEN_FILTER_BITS = env.int("CATS_SEEN_FILTER_BITS", default=2**14)
+CATS_SEEN_FILTER_HASHES = env.int("CATS_SEEN_FILTER_HASHES", default=4)
+CATS_SEEN_FILTER_TTL = env.int("CATS_SEEN_FILTER_TTL", default=30 * 24 * 60 * 60)
+CATS_SEEN_FILTER_NEW_TTL = env.int("CATS_SEEN_FILTER_NEW_TTL", default=10 * 60)
+# Seconds between flushes of the buffered random-cats votes to the database.
+CATS_VOTE_FLUSH_INTERVAL = env.int("CATS_VOTE_FLUSH_INTERVAL", default=60)
+# Static entries are copied into the database scheduler when beat starts.
+CELERY_BEAT_SCHEDULE = {
+    "flush-votes": {
+        "task": "cats.apps.breeds.tasks.flush_votes",
+        "schedule": CATS_VOTE_FLUSH_INTERVAL,
+    },
+}
+# Breeds per page of the breeds list, and seconds a rendered page is cached for
+# at most (syncs and edits invalidate it sooner).
+CATS_BREEDS_PAGE_SIZE = env.int("CATS_BREEDS_PAGE_SIZE", default=50)
+CATS_BREEDS_CACHE_TIMEOUT = env.int("CATS_BREEDS_CACHE_TIMEOUT", default=24 * 60 * 60)
+# Results of a breed search, best ranked first.
+CATS_BREEDS_SEARCH_LIMIT = env.int("CATS_BREEDS_SEARCH_LIMIT", default=20)
@@ -20,8 +20,17 @@ CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         "LOCATION": "",
-    }
+    },
+    # Bounded by the client (CATS_API_CACHE_MAX_ENTRIES, least recently used
+    # first); the backend's random culling only kicks in past that.
+    "cats-api": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": "/tmp/cats-api-cache",
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 2 * CATS_API_CACHE_MAX_ENTRIES},  # noqa F405
+    },
 }
+CATS_API_CACHE = env("CATS_API_CACHE", default="cats-api")
 
 # EMAIL
 # ------------------------------------------------------------------------------
@@ -32,8 +32,23 @@ CACHES = {
             # https://github.com/jazzband/django-redis#memcached-exceptions-behavior
             "IGNORE_EXCEPTIONS": True,
         },
-    }
+    },
+    # Upstream API responses, bounded to CATS_API_CACHE_MAX_ENTRIES by the
+    # client. Kept out of the database of the broker and the vote buffers.
+    "cats-api": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": env(
+            "CATS_API_CACHE_URL", default=env("REDIS_URL").rsplit("/", 1)[0] + "/1"
+        ),
+        "KEY_PREFIX": "cats-api",
+        "TIMEOUT": None,
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
 }
+CATS_API_CACHE = env("CATS_API_CACHE", default="cats-api")
 
 # SECURITY
 # ------------------------------------------------------------------------------
@@ -8,7 +8,13 @@ from django.views.generic import TemplateView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework.authtoken.views import obtain_auth_token
 
-from cats.apps.breeds.views import HomeView
+from cats.apps.breeds.views import (
+    HomeView,
+    ImageResizeView,
+    MostLikedView,
+    RandomImagesView,
+    VoteView,
+)
 
 urlpatterns = [
     path("", HomeView.as_view(), name="home"),
@@ -17,6 +23,13 @@ urlpatterns = [
         TemplateView.as_view(template_name="breeds/random.html"),
         name="random",
     ),
+    path(
+        "random/<slug:version>.<slug:fmt>.json",
+        RandomImagesView.as_view(),
+        name="random-images",
+    ),
+    path("random/votes", VoteView.as_view(), name="random-vote"),
+    path("random/most-liked.json", MostLikedView.as_view(), name="most-liked"),
     path(
         "breeds/",
         include("cats.apps.breeds.urls", namespace="breeds"),
@@ -35,6 +48,12 @@ urlpatterns = [
     path("users/", include("cats.apps.users.urls", namespace="users")),
     path("accounts/", include("allauth.urls")),
     # Your stuff: custom urls includes go here
+    # Must come before the media files served in development.
+    path(
+        "media/resize/<int:pk>/<int:width>x<int:height>.<str:fmt>",
+        ImageResizeView.as_view(),
+        name="image-resize",
+    ),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 if settings.DEBUG:
     # Static file serving when using Gunicorn + Uvicorn for local web socket development